@@ -15,15 +15,19 @@ from concurrent.futures import ProcessPoolExecutor
 from src.BUS.bus_dsl import *
 from src.Evaluation.evaluation import *
 from src.Optimizer.optimizer import *
+import src.BUS.bus_dsl as busDSL
 import time
 
 class Plist:
 
     def __init__(self, constants=[], scalars=[], dsfs=[]):
         self.plist = {}
+        self.typed_plist = {}
         
+        # The star imports above also bring in the base DSL classes, so the
+        # BUS classes are named explicitly for the leaves to be shared
         for value in constants:
-            const = Constant.new(value)
+            const = busDSL.Constant.new(value)
             self.insert(const)
 
         for scalar in scalars:
@@ -34,6 +38,9 @@ class Plist:
             self.insert(p)
         
     def insert(self, item):
+        # Programs of this size changed, so drop the memoized views
+        self.typed_plist.pop(item.get_size(), None)
+
         if self.plist.get(item.get_size()) is None:
             self.plist[item.get_size()] = {}
             self.plist[item.get_size()][type(item).__name__] = []
@@ -54,9 +61,31 @@ class Plist:
         
         return None
 
+    def get_by_types(self, size, ptypes):
+        """
+        Returns the programs of the given size whose type is in ptypes,
+        a frozenset of class names. The list is memoized until a program
+        of that size is inserted.
+        """
+        typed_programs = self.typed_plist.setdefault(size, {})
+        programs = typed_programs.get(ptypes)
+
+        if programs is None:
+            programs = []
+            if self.plist.get(size) is not None:
+                for ptype, p in self.plist[size].items():
+                    if ptype in ptypes:
+                        programs.extend(p)
+
+            typed_programs[ptypes] = programs
+
+        return programs
+
     def copy(self):
         newPlist = Plist()
         newPlist.plist = self.plist.copy()
+        # The copy shares the program lists, so it can share their views
+        newPlist.typed_plist = self.typed_plist
         return newPlist
 
 
@@ -120,10 +149,13 @@ class BUS:
                         self.logger.log('Correct: ' + str(res[1]))
 
                         if res[1]:
-                            const_param_values, score, is_optimized = optimizer.optimize(arg, res[0])
+                            # The optimizer sets the constants in place, while the
+                            # nodes of arg are shared with other programs
+                            program = arg.clone()
+                            const_param_values, score, is_optimized = optimizer.optimize(program, res[0])
                             if is_optimized:
-                                pdescr = {'header': 'Optimized Program', 'psize': arg.get_size(), 'score': score}
-                                self.logger.log_program(arg.to_string(indent=1), pdescr)
+                                pdescr = {'header': 'Optimized Program', 'psize': program.get_size(), 'score': score}
+                                self.logger.log_program(program.to_string(indent=1), pdescr)
 
                 ppool = []
 
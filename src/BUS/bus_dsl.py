@@ -12,36 +12,116 @@ so that the BUS algorithm can grow the programs accordingly.
 from random import choice
 from pygame.constants import K_w, K_s, K_a, K_d
 import numpy as np
-import itertools
+import sys
+import textwrap
 import src.dsl as baseDSL
 
+
+def indent_string(string, indent):
+    """
+    Prefixes every line of a cached, indent-free program string
+    with the given number of tabs.
+    """
+    if indent == 0:
+        return string
+    return textwrap.indent(string, '\t' * indent)
+
+
+class CachedString:
+    """
+    Mixin of the BUS nodes, which are never modified once built by new(),
+    caching the indent-free string of the node on first use.
+    """
+    _str = None
+
+    def get_cached_string(self):
+        if self._str is None:
+            self._str = sys.intern(super(CachedString, self).to_string())
+        return self._str
+
+    def to_string(self, indent=0):
+        # Expressions are written the same at every indentation
+        return self.get_cached_string()
+
+    def clone(self):
+        # The copy may be modified in place, by the optimizer for instance,
+        # so it is made of nodes of the base DSL, whose strings are not cached
+        node = super(CachedString, self).clone()
+        node.__class__ = type(self).__bases__[-1]
+        node.__dict__.pop('_str', None)
+        return node
+
+
+class SharedLeaf:
+    """
+    Mixin of the BUS leaves, whose new() returns one shared node for equal
+    arguments. Programs are cloned before anything modifies them in place.
+    """
+    instances = {}
+
+    @classmethod
+    def new(cls, *args):
+        # Arguments of different types, such as 1 and 1.0, make different leaves
+        key = (cls,) + tuple((type(arg), arg) for arg in args)
+        if key not in SharedLeaf.instances:
+            SharedLeaf.instances[key] = super(SharedLeaf, cls).new(*args)
+        return SharedLeaf.instances[key]
+
+
+class CachedStatementString(CachedString):
+    """
+    Mixin of the BUS statements, which re-tab their cached string
+    instead of rebuilding it at every indentation.
+    """
+    def to_string(self, indent=0):
+        return indent_string(self.get_cached_string(), indent)
+
+
+def grow_binary(cls, plist, psize, left_types, right_types, guard=None):
+    """
+    Yields the programs of size psize built by cls.new(left, right) from
+    the programs of plist whose types are in left_types and right_types.
+    If given, guard(left, right) must hold for the program to be built.
+    """
+    # The costs of both children add up to psize-1, each being at least 1
+    for left_cost in range(1, psize-1):
+        right_cost = psize - 1 - left_cost
+        for left in plist.get_by_types(left_cost, left_types):
+            for right in plist.get_by_types(right_cost, right_types):
+                if guard is None or guard(left, right):
+                    yield cls.new(left, right)
+
+
+def distinct_operands(left, right):
+    # Equal programs can be distinct nodes, for instance leaves built
+    # outside of this module, so their strings are compared
+    return left.to_string() != right.to_string()
+
+
+def ordered_operands(left, right):
+    # Commutative operators only keep the operand order of (a op b) for
+    # a <= b, so that (b op a) is never grown
+    return left.to_string() <= right.to_string()
+
+
 """
 This class implements an AST node representing a constant.
 """
-class Constant(baseDSL.Constant):
-
-    def __init__(self):
-        super(Constant, self).__init__()
+class Constant(SharedLeaf, CachedString, baseDSL.Constant):
+    pass
 
 """
 This is a class derived from the Node clas. It is interpreted as
 choosing/returning an action among the available actions.
 """
-class ReturnAction(baseDSL.ReturnAction):
-
-    def __init__(self):
-        super(ReturnAction, self).__init__()
+class ReturnAction(CachedStatementString, baseDSL.ReturnAction):
 
     def grow(plist, psize):
-        nplist = []
-
         programs = plist.get(psize-1, VarFromArray.className())
-        
+
         if programs is not None:
             for p in programs:
-                ra = ReturnAction.new(p)
-                nplist.append(ra)
-                yield ra
+                yield ReturnAction.new(p)
 
 
 """
@@ -52,39 +132,10 @@ provided iterable directly. For example,
 for each x in coords:
     # loop body
 """
-class ForEach(baseDSL.ForEach):
-
-    def __init__(self):
-        super(IT, self).__init__()
+class ForEach(CachedStatementString, baseDSL.ForEach):
 
     def grow(plist, psize):
-        nplist = []
-        valid_iterable = [VarArray.className()]
-        valid_loop_body = [IT.className(), ITE.className()]
-        
-        cost_combinations = itertools.product(range(psize-1), repeat=2)
-
-        for cost in cost_combinations:
-
-            if cost[0] + cost[1] + 1 == psize:
-                program_set_1 = plist.get(cost[0])
-                program_set_2 = plist.get(cost[1])
-
-                if program_set_1 is not None and program_set_2 is not None:
-
-                    for t1, p1 in program_set_1.items():
-                        if t1 in valid_iterable:
-                            for iter in p1:
-
-                                for t2, p2 in program_set_2.items():
-                                    if t2 in valid_loop_body:
-                                        for loop_body in p2:
-
-                                            for_each = ForEach.new(iter, loop_body)
-                                            nplist.append(for_each)
-                                            yield for_each
-
-        return nplist
+        return grow_binary(ForEach, plist, psize, _LOOP_ITERABLES, _LOOP_BODIES)
 
 
 """
@@ -92,93 +143,38 @@ This class represents an if-then conditional statement in the DSL. It is
 interpreted as the if-then conditional statements in general-purpose programming
 languages
 """
-class IT(baseDSL.IT):
-
-    def __init__(self):
-        super(IT, self).__init__()
+class IT(CachedStatementString, baseDSL.IT):
 
     def grow(plist, psize):
-        nplist = []
-        valid_dsbs = [LessThan.className(), GreaterThan.className(), EqualTo.className(), NonPlayerObjectApproaching.className()]
-        valid_return = [ReturnAction.className()]
+        return grow_binary(IT, plist, psize, _CONDITIONS, _IT_BODIES)
 
-        cost_combinations = itertools.product(range(psize-1), repeat=2)
-
-        for cost in cost_combinations:
-
-            if cost[0] + cost[1] + 1 == psize:
-                program_set_1 = plist.get(cost[0])
-                program_set_2 = plist.get(cost[1])
-
-                if program_set_1 is not None and program_set_2 is not None:
-
-                    for t1, p1 in program_set_1.items():
-                        if t1 in valid_dsbs:    
-                            for if_cond in p1:
-                    
-                                for t2, p2 in program_set_2.items():
-                                    if t2 in valid_return:
-                                        for if_body in p2:
-                                            
-                                            it = IT.new(if_cond, if_body)
-                                            nplist.append(it)
-                                            yield it
-
-        return nplist
-    
 
 """
 This class represents an if-then-else conditional statement in the 
 DSL. It is interpreted as the if-then-else conditional statements in
 general-purpose programming languages.
 """
-class ITE(baseDSL.ITE):
-
-    def __init__(self):
-        super(ITE, self).__init__()
+class ITE(CachedStatementString, baseDSL.ITE):
 
     def grow(plist, psize):
-        nplist = []
-        valid_dsbs = [LessThan.className(), GreaterThan.className(), EqualTo.className(), NonPlayerObjectApproaching.className()]
-        valid_return = [ReturnAction.className(), IT.className()]
-
-        cost_combinations = itertools.product(range(psize-1), repeat=3)
-        
-        for cost in cost_combinations:
-            if cost[0] + cost[1] + cost[2] + 1 == psize:
-                program_set_1 = plist.get(cost[0])
-                program_set_2 = plist.get(cost[1])
-                program_set_3 = plist.get(cost[2])
-
-                if program_set_1 is not None and program_set_2 is not None and program_set_3 is not None:
-                    
-                    for t1, p1 in program_set_1.items():
-                        if t1 in valid_dsbs:
-                            for if_cond in p1:
+        # The costs of the three children add up to psize-1, each being at most psize-2
+        for cond_cost in range(psize-1):
+            for if_cost in range(max(0, 1-cond_cost), min(psize-2, psize-1-cond_cost) + 1):
+                else_cost = psize - 1 - cond_cost - if_cost
 
-                                for t2, p2 in program_set_2.items():
-                                    if t2 in valid_return:
-                                        for if_body in p2:
-
-                                            for t3, p3 in program_set_3.items():
-                                                if t3 in valid_return:
-                                                    for else_body in p3:
-
-                                                        ite = ITE.new(if_cond, if_body, else_body)
-                                                        nplist.append(ite)
-                                                        yield ite
-
-        return nplist
+                for if_cond in plist.get_by_types(cond_cost, _CONDITIONS):
+                    for if_body in plist.get_by_types(if_cost, _ITE_BODIES):
+                        for else_body in plist.get_by_types(else_cost, _ITE_BODIES):
+                            yield ITE.new(if_cond, if_body, else_body)
 
 
 """
 This class implements a domain-specific function that returns
 the x-position of the player on the screen.
 """
-class PlayerPosition(baseDSL.PlayerPosition):
+class PlayerPosition(CachedString, baseDSL.PlayerPosition):
+    pass
 
-    def __init__(self):
-        super(PlayerPosition, self).__init__()
 
 """
 This class implements a domain-specific function that returns
@@ -186,49 +182,39 @@ the x-position of the non-player object. The non-player object
 is the falling fruit in the Catcher game, while in Pong, it is
 the ball.
 """
-class NonPlayerObjectPosition(baseDSL.NonPlayerObjectPosition):
-
-    def __init__(self):
-        super(NonPlayerObjectPosition, self).__init__()
+class NonPlayerObjectPosition(CachedString, baseDSL.NonPlayerObjectPosition):
+    pass
 
 
 """
 This class implements a DSF that returns True if the non-player
 object is moving towards the player and False otherwise.
 """
-class NonPlayerObjectApproaching(baseDSL.NonPlayerObjectApproaching):
-
-    def __init__(self):
-        super(NonPlayerObjectApproaching, self).__init__()
+class NonPlayerObjectApproaching(CachedString, baseDSL.NonPlayerObjectApproaching):
+    pass
 
 
 """
 This class implements an AST node represent a list variable
 """
-class VarArray(baseDSL.VarArray):
-    
-    def __init__(self):
-        super(VarArray, self).__init__()
+class VarArray(SharedLeaf, CachedString, baseDSL.VarArray):
+    pass
 
 
 """
 This class implements an AST node representing a domain-specific scalar variable.
 For instance, the player's paddle width.
 """
-class VarScalar(baseDSL.VarScalar):
-
-    def __init__(self):
-        super(VarScalar, self).__init__()
+class VarScalar(SharedLeaf, CachedString, baseDSL.VarScalar):
+    pass
 
 
 """
 This class implements an AST node representing a domain-specific variable from
 an array. For example, actions[0]
 """
-class VarFromArray(baseDSL.VarFromArray):
-
-    def __init__(self):
-        super(VarFromArray, self).__init__()
+class VarFromArray(SharedLeaf, CachedString, baseDSL.VarFromArray):
+    pass
 
 
 """
@@ -236,38 +222,10 @@ This class implements an AST node representing the '<' comparison
 operator. It returns either True or False on calling its interpret
 method.
 """
-class LessThan(baseDSL.LessThan):
-
-    def __init__(self):
-        super(LessThan, self).__init__()
+class LessThan(CachedString, baseDSL.LessThan):
 
     def grow(plist, psize):
-        nplist = []
-        valid_nodes = [PlayerPosition.className(), NonPlayerObjectPosition.className(), Plus.className(),
-            Minus.className(), Divide.className(), Times.className(), Constant.className()]
-
-        cost_combinations = itertools.product(range(psize-1), repeat=2)
-        
-        for cost in cost_combinations:
-            if cost[0] + cost[1] + 1 == psize:
-                program_set_1 = plist.get(cost[0])
-                program_set_2 = plist.get(cost[1])
-
-                if program_set_1 is not None and program_set_2 is not None:
-                    for t1, p1 in program_set_1.items():
-                        if t1 in valid_nodes:
-                            for left in p1:
-
-                                for t2, p2 in program_set_2.items():
-                                    if t2 in valid_nodes:
-                                        for right in p2:
-
-                                            if left.to_string() != right.to_string():
-                                                lt = LessThan.new(left, right)
-                                                nplist.append(lt)
-                                                yield lt
-
-        return nplist
+        return grow_binary(LessThan, plist, psize, _COMPARISON_OPERANDS, _COMPARISON_OPERANDS, distinct_operands)
 
 
 """
@@ -275,262 +233,99 @@ This class implements an AST node representing the '>' comparison
 operator. It returns either True or False on calling its interpret
 method.
 """
-class GreaterThan(baseDSL.GreaterThan):
-
-    def __init__(self):
-        super(GreaterThan, self).__init__()
+class GreaterThan(CachedString, baseDSL.GreaterThan):
 
     def grow(plist, psize):
-        nplist = []
-        valid_nodes = [PlayerPosition.className(), NonPlayerObjectPosition.className(), Plus.className(),
-            Minus.className(), Divide.className(), Times.className(), Constant.className()]
-
-        cost_combinations = itertools.product(range(psize-1), repeat=2)
-        
-        for cost in cost_combinations:
-            if cost[0] + cost[1] + 1 == psize:
-                program_set_1 = plist.get(cost[0])
-                program_set_2 = plist.get(cost[1])
-
-                if program_set_1 is not None and program_set_2 is not None:
-                    for t1, p1 in program_set_1.items():
-                        if t1 in valid_nodes:
-                            for left in p1:
-
-                                for t2, p2 in program_set_2.items():
-                                    if t2 in valid_nodes:
-                                        for right in p2:
-
-                                            if left.to_string() != right.to_string():
-                                                gt = GreaterThan.new(left, right)
-                                                nplist.append(gt)
-                                                yield gt
-
-        return nplist
+        return grow_binary(GreaterThan, plist, psize, _COMPARISON_OPERANDS, _COMPARISON_OPERANDS, distinct_operands)
 
 
 """
 This class implements an AST node representing the '==' comparison
 operator
 """
-class EqualTo(baseDSL.EqualTo):
-
-    def __init__(self):
-        super(EqualTo, self).__init__()
+class EqualTo(CachedString, baseDSL.EqualTo):
 
     def grow(plist, psize):
-        nplist = []
-        valid_nodes = [PlayerPosition.className(), NonPlayerObjectPosition.className(), Plus.className(),
-            Minus.className(), Divide.className(), Times.className(), Constant.className()]
-
-        cost_combinations = itertools.product(range(psize-1), repeat=2)
-        
-        for cost in cost_combinations:
-            if cost[0] + cost[1] + 1 == psize:
-                program_set_1 = plist.get(cost[0])
-                program_set_2 = plist.get(cost[1])
-
-                if program_set_1 is not None and program_set_2 is not None:
-                    for t1, p1 in program_set_1.items():
-                        if t1 in valid_nodes:
-                            for left in p1:
-
-                                for t2, p2 in program_set_2.items():
-                                    if t2 in valid_nodes:
-                                        for right in p2:
-
-                                            if left.to_string() != right.to_string():
-                                                eq = EqualTo.new(left, right)
-                                                nplist.append(eq)
-                                                yield eq
-
-        return nplist
+        return grow_binary(EqualTo, plist, psize, _COMPARISON_OPERANDS, _COMPARISON_OPERANDS, distinct_operands)
 
 
 """
 This class implements an AST node representing the addition operator.
 """
-class Plus(baseDSL.Plus):
-
-    def __init__(self):
-        super(Plus, self).__init__()
+class Plus(CachedString, baseDSL.Plus):
 
     def grow(plist, psize):
-        nplist = []
-        valid_nodes = [VarScalar.className(), PlayerPosition.className(), NonPlayerObjectPosition.className(), 
-            Constant.className(), Times.className(), Minus.className(), Plus.className(), Divide.className()]
-
-        cost_combinations = itertools.product(range(psize-1), repeat=2)
-
-        for cost in cost_combinations:
-            if cost[0] + cost[1] + 1 == psize:
-                program_set_1 = plist.get(cost[0])
-                program_set_2 = plist.get(cost[1])
-
-                if program_set_1 is not None and program_set_2 is not None:
-                    for t1, p1 in program_set_1.items():
-                        if t1 in valid_nodes:
-                            for left in p1:
-                                
-                                for t2, p2 in program_set_2.items():
-                                    if t2 in valid_nodes:
-                                        for right in p2:
-                                            if left.to_string() != '0' and right.to_string() != '0':
-                                                plus = Plus.new(left, right)
-                                                nplist.append(plus)
-                                                yield plus
-            
-        return nplist
+        return grow_binary(Plus, plist, psize, _ARITHMETIC_OPERANDS, _ARITHMETIC_OPERANDS,
+            lambda left, right: left.to_string() != '0' and right.to_string() != '0' and ordered_operands(left, right))
 
 
 """
 This class implements an AST node representing the multiplication operator
 """
-class Times(baseDSL.Times):
-
-    def __init__(self):
-        super(Times, self).__init__()
+class Times(CachedString, baseDSL.Times):
 
     def grow(plist, psize):
-        nplist = []
-        valid_nodes = [VarScalar.className(), PlayerPosition.className(), NonPlayerObjectPosition.className(),
-            Constant.className(), Times.className(), Minus.className(), Plus.className(), Divide.className()]
-
-        cost_combinations = itertools.product(range(psize-1), repeat=2)
-
-        for cost in cost_combinations:
-            if cost[0] + cost[1] + 1 == psize:
-                program_set_1 = plist.get(cost[0])
-                program_set_2 = plist.get(cost[1])
-
-                if program_set_1 is not None and program_set_2 is not None:
-                    for t1, p1 in program_set_1.items():
-                        if t1 in valid_nodes:
-                            for left in p1:
-                                
-                                for t2, p2 in program_set_2.items():
-                                    if t2 in valid_nodes:
-                                        for right in p2:
-                                            times = Times.new(left, right)
-                                            eq = Times.new(right, left)
-                                            is_equivalent = False
-                                            for p in nplist:
-                                                if p.to_string() == eq.to_string():
-                                                    is_equivalent = True
-
-                                            if not is_equivalent:
-                                                nplist.append(times)
-                                                yield times
-
-        return nplist
+        return grow_binary(Times, plist, psize, _ARITHMETIC_OPERANDS, _ARITHMETIC_OPERANDS,
+            lambda left, right: left.to_string() not in _TRIVIAL_FACTORS and right.to_string() not in _TRIVIAL_FACTORS
+                and ordered_operands(left, right))
 
 
 """
 This class implements an AST node representing the minus operator
 """
-class Minus(baseDSL.Minus):
-
-    def __init__(self):
-        super(Minus, self).__init__()
+class Minus(CachedString, baseDSL.Minus):
 
     def grow(plist, psize):
-        nplist = []
-        valid_nodes = [VarScalar.className(), PlayerPosition.className(), NonPlayerObjectPosition.className(),
-            Constant.className(), Times.className(), Minus.className(), Plus.className(), Divide.className()]
-
-        cost_combinations = itertools.product(range(psize-1), repeat=2)
-
-        for cost in cost_combinations:
-            if cost[0] + cost[1] + 1 == psize:
-                program_set_1 = plist.get(cost[0])
-                program_set_2 = plist.get(cost[1])
-
-                if program_set_1 is not None and program_set_2 is not None:
-                    for t1, p1 in program_set_1.items():
-                        if t1 in valid_nodes:
-                            for left in p1:
-                                
-                                for t2, p2 in program_set_2.items():
-                                    if t2 in valid_nodes:
-                                        for right in p2:
-                                            minus = Minus.new(left, right)
-                                            if left.to_string() != right.to_string() and right.to_string() != '0':
-                                                nplist.append(minus)
-                                                yield minus
-
-        return nplist
+        return grow_binary(Minus, plist, psize, _ARITHMETIC_OPERANDS, _ARITHMETIC_OPERANDS,
+            lambda left, right: distinct_operands(left, right) and right.to_string() != '0')
 
 
 """
 This class implements an AST node representing the integer division operator
 """
-class Divide(baseDSL.Divide):
-
-    def __init__(self):
-        super(Divide, self).__init__()
+class Divide(CachedString, baseDSL.Divide):
 
     def grow(plist, psize):
-        nplist = []
-        valid_nodes = [VarScalar.className(), PlayerPosition.className(), NonPlayerObjectPosition.className(),
-            Constant.className(), Times.className(), Minus.className(), Plus.className(), Divide.className()]
-
-        cost_combinations = itertools.product(range(psize-1), repeat=2)
-
-        for cost in cost_combinations:
-            if cost[0] + cost[1] + 1 == psize:
-                program_set_1 = plist.get(cost[0])
-                program_set_2 = plist.get(cost[1])
-
-                if program_set_1 is not None and program_set_2 is not None:
-                    for t1, p1 in program_set_1.items():
-                        if t1 in valid_nodes:
-                            for left in p1:
-                                
-                                for t2, p2 in program_set_2.items():
-                                    if t2 in valid_nodes:
-                                        for right in p2:
-                                            if right.to_string() != '0' and left.to_string() != '0':
-                                                if left.to_string() != right.to_string():
-                                                    divide = Divide.new(left, right)
-                                                    nplist.append(divide)
-                                                    yield divide
-        
-        return nplist
+        return grow_binary(Divide, plist, psize, _ARITHMETIC_OPERANDS, _ARITHMETIC_OPERANDS,
+            lambda left, right: right.to_string() != '0' and left.to_string() != '0' and distinct_operands(left, right))
 
 
 """
 This class implements the initial symbol of the DSL.
 """
-class Strategy(baseDSL.Strategy):
-
-    def __init__(self):
-        super(Strategy, self).__init__()
+class Strategy(CachedStatementString, baseDSL.Strategy):
 
     def grow(plist, psize):
-        nplist = []
-        valid_first_statement = [IT.className(), ITE.className()]
-        valid_next_statements = [Strategy.className(), ReturnAction.className(), type(None).__name__]
-
-        cost_combinations = itertools.product(range(psize+1), repeat=2)
-
-        for cost in cost_combinations:
-            if cost[0] + cost[1] == psize:
-                program_set_1 = plist.get(cost[0])
-                program_set_2 = plist.get(cost[1])
-                if cost[1] == 0 and program_set_2 is None:
-                    program_set_2 = {}
-                    program_set_2[type(None).__name__] = [None]
-
-                if program_set_1 is not None and program_set_2 is not None:
-                    for t1, p1 in program_set_1.items():
-                        if t1 in valid_first_statement:
-                            for statement in p1:
-
-                                for t2, p2 in program_set_2.items():
-                                    if t2 in valid_next_statements:
-                                        for next_statements in p2:
-                                            p = Strategy.new(statement, next_statements)
-                                            nplist.append(p)
-                                            yield p
-        
-        return nplist
+        for statement_cost in range(psize+1):
+            next_cost = psize - statement_cost
+
+            if next_cost == 0 and plist.get(next_cost) is None:
+                next_statements_list = _NO_NEXT_STATEMENTS
+            else:
+                next_statements_list = plist.get_by_types(next_cost, _NEXT_STATEMENTS)
+
+            for statement in plist.get_by_types(statement_cost, _FIRST_STATEMENTS):
+                for next_statements in next_statements_list:
+                    yield Strategy.new(statement, next_statements)
+
+
+# Types of the children that the grow methods combine, built once so that
+# the same frozensets are used as keys of the Plist type buckets
+_LOOP_ITERABLES = frozenset([VarArray.className()])
+_LOOP_BODIES = frozenset([IT.className(), ITE.className()])
+_CONDITIONS = frozenset([LessThan.className(), GreaterThan.className(), EqualTo.className(),
+    NonPlayerObjectApproaching.className()])
+_IT_BODIES = frozenset([ReturnAction.className()])
+_ITE_BODIES = frozenset([ReturnAction.className(), IT.className()])
+_COMPARISON_OPERANDS = frozenset([PlayerPosition.className(), NonPlayerObjectPosition.className(), Plus.className(),
+    Minus.className(), Divide.className(), Times.className(), Constant.className()])
+_ARITHMETIC_OPERANDS = frozenset([VarScalar.className(), PlayerPosition.className(), NonPlayerObjectPosition.className(),
+    Constant.className(), Times.className(), Minus.className(), Plus.className(), Divide.className()])
+_FIRST_STATEMENTS = frozenset([IT.className(), ITE.className()])
+_NEXT_STATEMENTS = frozenset([Strategy.className(), ReturnAction.className(), type(None).__name__])
+
+# Factors for which (x * c) reduces to a smaller program, x or c itself
+_TRIVIAL_FACTORS = frozenset(['0', '0.0', '1', '1.0'])
+
+# Next statements of a strategy ending with its first statement
+_NO_NEXT_STATEMENTS = (None,)
@@ -133,11 +133,19 @@ class Evaluation:
         score = Evaluation.MIN_SCORE
         games_played = 0
         continue_eval = True
+
+        # Compile the program once, it is then called at every game tick
+        try:
+            strategy = program.compile_bytecode()
+        except:
+            self.clean_up()
+            return tuple([]), Evaluation.MIN_SCORE
+
         while continue_eval:
             self.init_game()
             while not self.game_over():
                 try:
-                    score = self.play(program)
+                    score = self.play(strategy)
                 except:
                     self.clean_up()
                     return tuple([]), Evaluation.MIN_SCORE
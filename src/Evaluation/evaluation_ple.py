@@ -26,9 +26,13 @@ class EvaluationPle(Evaluation):
     def game_over(self):
         return self.game.game_over()
 
-    def play(self, program):
+    def play(self, strategy):
+        """
+        Plays one game tick with strategy, the function returned by
+        Node.compile_bytecode.
+        """
         env = self.update_env(self.p.getGameState(), self.p.getActionSet())
-        action = program.interpret(env)
+        action = strategy(env)
         self.p.act(action)
         return self.p.score()
 
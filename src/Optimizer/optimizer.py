@@ -21,10 +21,21 @@ class Optimizer:
         self.iterations = iterations
         self.kappa = kappa
         self.parallel = parallel
+        self.avg_time = None
     
     def get_parallel(self):
         return self.parallel
 
+    def get_avg_time(self):
+        return self.avg_time
+
+    def update_avg_time(self, optimize_time):
+        # Exponential moving average of the time taken by one optimize call
+        if self.avg_time is None:
+            self.avg_time = optimize_time
+        else:
+            self.avg_time = 0.8 * self.avg_time + 0.2 * optimize_time
+
     def set_baseline_eval(self, baseline_eval):
         self.baseline_eval = baseline_eval
 
@@ -0,0 +1,82 @@
+"""
+start_optimizer.py
+
+Author: Olivier Vadiavaloo
+
+Description:
+This module provides the driver code that runs the Optimizer on a pool
+of programs found by a synthesizer and returns the best program of
+the pool once its constants have been optimized.
+"""
+from functools import partial
+from time import perf_counter
+import math
+
+# Estimated cost in seconds of dispatching a pool of programs to worker
+# processes, below which the programs are optimized in-process
+POOL_OVERHEAD = 0.2
+
+def optimize_program(optimizer, args):
+    # Timed in the process running the call, so that the time does not
+    # depend on how many calls run at once
+    start = perf_counter()
+    result = optimizer.optimize(*args)
+    return result, perf_counter() - start
+
+
+def start_optimizer(optimizer, ppool, logger, get_timestamp, verbose=False, pool=None, pool_size=1):
+    """
+    Optimizes every program of ppool, a list of (program, eval, scores) tuples,
+    and returns the (program, eval, scores, is_optimized) tuple of the program
+    with the highest score after optimization.
+
+    If pool is given, the programs are optimized in parallel by its
+    pool_size worker processes. The pool is owned by the caller, so that its
+    workers are started once and reused by every call. Results are logged as
+    soon as each worker returns them. The programs are still optimized
+    in-process when the average optimize time says the pool would not pay
+    off. Only the calls that optimized constants count towards that average.
+
+    The optimizer sets the constants of a program in place, so programs
+    optimized in-process are cloned first, while the workers receive
+    pickled copies anyway.
+    """
+    avg_time = optimizer.get_avg_time()
+    is_serial = pool is None
+    if not is_serial and avg_time is not None:
+        # Time saved by running up to pool_size optimize calls at once
+        saved_time = avg_time * (len(ppool) - math.ceil(len(ppool) / pool_size))
+        is_serial = saved_time < POOL_OVERHEAD
+
+    if is_serial:
+        results = (optimize_program(optimizer, (ast.clone(), score, scores)) for ast, score, scores in ppool)
+    else:
+        # The caller sends about one program per worker, and each call is a
+        # whole Bayesian optimization, so programs are dispatched one by one
+        results = pool.imap_unordered(partial(optimize_program, optimizer), ppool, chunksize=1)
+
+    best_result = None
+    optimize_times = []
+    for (ast, params, score, scores, is_optimized), optimize_time in results:
+        # Programs without constants return at once and would skew the average
+        if params:
+            optimize_times.append(optimize_time)
+
+        if is_optimized or verbose:
+            header = 'Optimized Program' if is_optimized else 'Unoptimized Program'
+            pdescr = {
+                    'header': header,
+                    'psize': ast.get_size(),
+                    'score': score,
+                    'timestamp': get_timestamp()
+                }
+            logger.log_program(ast.to_string(), pdescr)
+            logger.log('Scores: ' + str(scores).strip('()'), end='\n\n')
+
+        if best_result is None or score > best_result[1]:
+            best_result = (ast, score, scores, is_optimized)
+
+    if optimize_times:
+        optimizer.update_avg_time(sum(optimize_times) / len(optimize_times))
+
+    return best_result
@@ -17,10 +17,13 @@ class ProgramMutator:
         self.max_depth = max_depth
         self.max_size = max_size
 
+        # Whether each child type of the grammar is a terminal, by type name
+        self.terminal_types = {}
+
     def generate_random(self, closed_list):
         while True:
             initial_nodes = Node.get_valid_children_types()[0]
-            random_p = Node.instance(random.choice(list(initial_nodes)))
+            random_p = Node.instance(random.choice(initial_nodes))
             self.complete_program(random_p, self.initial_depth, self.max_depth, self.max_size)
             random_p.check_correct_size()
 
@@ -31,94 +34,127 @@ class ProgramMutator:
         if not isinstance(p, Node):
             return
 
-        for i in range(p.get_max_number_children()):
-            valid_ith_child_types = p.get_valid_children_types()[i]
+        # Each entry is a node, its depth and the next of its child slots to
+        # fill. A child's subtree is completed before the next slot is filled.
+        stack = [(p, depth, 0)]
+        while stack:
+            node, depth, i = stack.pop()
+            if i >= node.get_max_number_children():
+                continue
+
+            stack.append((node, depth, i+1))
+            valid_ith_child_types = node.get_valid_children_types()[i]
 
-            if isinstance(p, ReturnAction):
-                action_index = random.choice(list(valid_ith_child_types))
-                child = VarFromArray.new('actions', action_index)
-                p.add_child(child)
+            if isinstance(node, ReturnAction):
+                action_index = random.choice(valid_ith_child_types)
+                node.add_child(VarFromArray.new('actions', action_index))
+                continue
 
-            # if p is a scalar or constant, no need to call complete_program on child
-            elif isinstance(p, VarScalar) or isinstance(p, VarFromArray) or \
-                isinstance(p, Constant) or isinstance(p, VarArray):
-                child = random.choice(list(valid_ith_child_types))
-                p.add_child(child)
+            # if node is a scalar or constant, its child is a value
+            if isinstance(node, (VarScalar, VarFromArray, Constant, VarArray)):
+                node.add_child(random.choice(valid_ith_child_types))
+                continue
 
             # if max depth is exceeded, get a terminal node
-            elif depth >= max_depth or p.get_size() >= max_size:
-                child = self.get_terminal_node(p, valid_ith_child_types)
-                p.add_child(child)
-                self.complete_program(child, depth+1, max_depth, max_size)
+            if depth >= max_depth or node.get_size() >= max_size:
+                child = self.get_terminal_node(node, valid_ith_child_types)
 
             # else choose a random child node
             else:
-                child = Node.instance(random.choice(list(valid_ith_child_types)))
-                p.add_child(child)
-                self.complete_program(child, depth+1, max_depth, max_size)
+                child = Node.instance(random.choice(valid_ith_child_types))
 
-    def get_terminal_node(self, p, valid_ith_child_types):
-        terminal_nodes = []
+            node.add_child(child)
+            if isinstance(child, Node):
+                stack.append((child, depth+1, 0))
 
-        for child_type in valid_ith_child_types:
+    def is_terminal_type(self, child_type):
+        if child_type not in self.terminal_types:
             if child_type is None or type(child_type) is int:
-                terminal_nodes.append(child_type)
-                continue
+                is_terminal = True
+            else:
+                is_terminal = child_type in [VarFromArray.className(), VarArray.className(), VarScalar.className(), Constant.className()] \
+                    or Node.instance(child_type).get_max_number_children() == 0
 
-            child = Node.instance(child_type)
-            if child_type in [VarFromArray.className(), VarArray.className(), VarScalar.className(), Constant.className()] \
-                or child.get_max_number_children() == 0:
-                terminal_nodes.append(child)
+            self.terminal_types[child_type] = is_terminal
 
-        if terminal_nodes == 0:
+        return self.terminal_types[child_type]
+
+    def get_terminal_node(self, p, valid_ith_child_types):
+        terminal_nodes = [child_type for child_type in valid_ith_child_types if self.is_terminal_type(child_type)]
+
+        if not terminal_nodes:
             for child_type in valid_ith_child_types:
                 child = Node.instance(child_type)
 
-                if child.get_max_children_number() == 1:
-                    terminal_nodes.append(child)
+                if child.get_max_number_children() == 1:
+                    terminal_nodes.append(child_type)
 
         if len(terminal_nodes) > 0:
-            return random.choice(terminal_nodes)
+            return Node.instance(random.choice(terminal_nodes))
 
-        return Node.instance(random.choice(list(valid_ith_child_types)))
+        return Node.instance(random.choice(valid_ith_child_types))
 
     def mutate_inner_nodes(self, p, index):
-        self.processed_nodes += 1
-
+        """
+        Returns a copy of p in which the index-th child slot, counting in
+        preorder from 1 for p itself, holds a new random subtree, or None if
+        p has no such slot. Only the nodes on the path from the root to the
+        slot are copied, so p is left unchanged and shares its other
+        subtrees with the copy.
+        """
         if not isinstance(p, Node):
-            return False
+            return None
+
+        # Each entry is a node and the next of its child slots to visit
+        processed_nodes = 1
+        stack = [(p, 0)]
+        while stack:
+            node, i = stack.pop()
+            if i >= node.get_max_number_children():
+                continue
 
-        for i in range(p.get_max_number_children()):
+            if index == processed_nodes:
+                valid_ith_child_types = node.get_valid_children_types()[i]
 
-            if index == self.processed_nodes:
-                valid_ith_child_types = p.get_valid_children_types()[i]
-                
-                child = Node.instance(random.choice(list(valid_ith_child_types)))
-                if isinstance(p, ReturnAction):
+                child = Node.instance(random.choice(valid_ith_child_types))
+                if isinstance(node, ReturnAction):
                     child = VarFromArray.new('actions', child)
 
                 elif isinstance(child, Node):
-                    self.complete_program(child, self.initial_depth, self.max_depth, self.max_size-p.get_size())
-                p.replace_child(child, i)
+                    self.complete_program(child, self.initial_depth, self.max_depth, self.max_size-node.get_size())
+
+                node = node.copy()
+                node.replace_child(child, i)
+
+                # The stack holds the ancestors of node, each with the slot
+                # after the one leading to node
+                for parent, j in reversed(stack):
+                    parent = parent.copy()
+                    parent.replace_child(node, j-1)
+                    node = parent
+
+                return node
 
-                return True
+            stack.append((node, i+1))
+            processed_nodes += 1
 
-            if self.mutate_inner_nodes(p.get_children()[i], index):
-                return True
+            child = node.get_children()[i]
+            if isinstance(child, Node):
+                stack.append((child, 0))
 
-        return False
+        return None
 
     def mutate(self, p, closed_list):
         while True:
             # print('p.get_size()', p.get_size())
-            index = random.randint(0, p.get_size())
+            index = random.randrange(p.get_size() + 1)
             # print('index', index)
             # print()
 
             # root will be mutated
             if index == 0:
                 ptypes = Node.get_valid_children_types()[0]
-                p = Node.instance(random.choice(list(ptypes)))
+                p = Node.instance(random.choice(ptypes))
                 self.complete_program(p, self.initial_depth, self.max_depth, self.max_size)
                 p.check_correct_size()
 
@@ -126,8 +162,9 @@ class ProgramMutator:
                 if closed_list.get(p.to_string()) is None:
                     return p
 
-            self.processed_nodes = 0
-            self.mutate_inner_nodes(p, index)
+            mutated_p = self.mutate_inner_nodes(p, index)
+            if mutated_p is not None:
+                p = mutated_p
             p.check_correct_size()
 
             # Check for duplicates
@@ -8,11 +8,11 @@ This file contains the code implementing the simulated annealing
 algorithm.
 
 """
-import copy as cp
 from time import time
 import random
 import multiprocessing as mp
 from math import exp
+from functools import partial
 
 from src.dsl import *
 from src.Evaluation.evaluation import *
@@ -23,7 +23,11 @@ from statistics import *
 
 class SimulatedAnnealing:
 
-    def __init__(self, time_limit, logger, optimizer, program_mutator):
+    # Number of mutations tried per candidate of a batch before settling
+    # for a smaller batch of distinct candidates
+    BATCH_ATTEMPTS = 10
+
+    def __init__(self, time_limit, logger, optimizer, program_mutator, batch_size=1):
         self.time_limit = time_limit
         self.logger = logger
         if optimizer is None:
@@ -34,14 +38,16 @@ class SimulatedAnnealing:
 
         self.program_mutator = program_mutator
 
-    def reduce_temp(self, current_t, epoch):
-        return current_t / (1 + self.alpha * epoch)
+        assert batch_size >= 1, 'SA batch size has to be a positive integer'
+        self.batch_size = batch_size
+
+    def reduce_temp(self, current_t):
+        # Geometric cooling schedule
+        return current_t * self.alpha
 
     def is_accept(self, j_diff, temp):
-        rand = random.uniform(0, 1)
-        if rand < min(1, exp(j_diff * (self.beta / temp))):
-            return True
-        return False
+        # Only called for j_diff <= 0, so the probability is at most 1
+        return random.random() < exp(j_diff * (self.beta / temp))
 
     def check_new_best(self, candidate, candidate_eval, candidate_scores, best_eval, eval_funct):
         if candidate_eval > best_eval:
@@ -65,11 +71,10 @@ class SimulatedAnnealing:
         self.beta = 100
         self.ppool = []     # for storing solutions to be optimized
 
-        if self.run_optimizer:
-            if self.optimizer.get_parallel():
-                # Change this number to change the number of
-                # solutions to be optimized in parallel
-                self.ppool_max_size = 5
+        if self.run_optimizer and self.optimizer.get_parallel():
+            # Number of solutions to be optimized in parallel,
+            # at least one for each worker of the pool
+            self.ppool_max_size = max(5, mp.cpu_count())
         else:
             self.ppool_max_size = 1
 
@@ -79,6 +84,47 @@ class SimulatedAnnealing:
         self.optimized_pscore_dict = {}
         self.unoptimized_pscore_dict = {}
 
+    def get_batch_size(self, current_t, final_t):
+        # A batch holds no more candidates than there are epochs left in
+        # the run, so that every evaluated candidate is considered
+        batch_size = 0
+        while current_t > final_t and batch_size < self.batch_size:
+            current_t = self.reduce_temp(current_t)
+            batch_size += 1
+
+        return batch_size
+
+    def mutate_batch(self, current, batch_size):
+        """
+        Returns up to batch_size distinct mutations of current. The mutator
+        skips programs of the closed list, which only holds evaluated
+        programs, so duplicates within the batch are skipped here. The batch
+        is cut short when current has too few distinct mutations left. The
+        mutations share their unchanged subtrees with current, which is left
+        intact.
+        """
+        candidates = {}
+        for _ in range(self.BATCH_ATTEMPTS * batch_size):
+            candidate = self.program_mutator.mutate(current, self.closed_list)
+            candidates.setdefault(candidate.to_string(), candidate)
+
+            if len(candidates) == batch_size:
+                break
+
+        return list(candidates.values())
+
+    def evaluate_batch(self, candidates, eval_funct):
+        """
+        Evaluates the candidates and returns their (scores, eval) pairs in
+        order. Batches of more than one candidate are evaluated in parallel
+        by the pool that synthesize keeps for the whole search.
+        """
+        if self.pool is None or len(candidates) == 1:
+            return [eval_funct.evaluate(candidate, verbose=True) for candidate in candidates]
+
+        chunksize = max(1, len(candidates) // (self.pool_size + 2))
+        return self.pool.map(partial(eval_funct.evaluate, verbose=True), candidates, chunksize=chunksize)
+
     def get_timestamp(self):
         return round((time() - self.start) / 60, 2)
 
@@ -107,8 +153,60 @@ class SimulatedAnnealing:
 
         """
         self.start = time()
+        # Scores are only recorded when they are plotted or saved
+        self.track_data = generate_plot or save_data
         self.init_attributes(eval_funct)
 
+        # Worker processes are started once and reused by every batch
+        # evaluation and every parallel optimizer run
+        if self.batch_size > 1 or self.ppool_max_size > 1:
+            self.pool_size = mp.cpu_count()
+            self.pool = mp.Pool(self.pool_size)
+        else:
+            self.pool_size = 1
+            self.pool = None
+
+        try:
+            best, best_eval, iterations = self.search(current_t, final_t, eval_funct, option, verbose_opt)
+        except BaseException:
+            # Stop the workers at once on errors and interrupts
+            if self.pool is not None:
+                self.pool.terminate()
+            raise
+        finally:
+            if self.pool is not None:
+                self.pool.close()
+                self.pool.join()
+                self.pool = None
+
+        self.logger.log('Running Time: ' + str(round(time() - self.start, 2)) + 'seconds')
+        self.logger.log('Iterations: ' + str(iterations), end='\n\n')
+
+        # Log best program
+        pdescr = {
+                'header': 'Best Program Found By SA',
+                'psize': best.get_size(), 
+                'score': best_eval,
+                'timestamp': self.closed_list[best.to_string()][1]
+            }
+        self.logger.log_program(best.to_string(), pdescr)
+
+        # Plot data if required
+        if generate_plot:
+            self.plot(plot_filename)
+
+        # Save data
+        if save_data:
+            self.save(plot_filename)
+
+        return best, best_eval
+
+    def search(self, current_t, final_t, eval_funct, option, verbose_opt):
+        """
+        Runs simulated annealing from the initial temperature current_t
+        until the time limit is reached, and returns the best program, its
+        score and the number of iterations.
+        """
         initial_t = current_t
         iterations = 0
         self.closed_list = {}
@@ -126,7 +224,7 @@ class SimulatedAnnealing:
             if self.run_optimizer:
                     self.optimizer.set_baseline_eval(best_eval)
 
-            if best_eval != Evaluation.MIN_SCORE:
+            if self.track_data and best_eval != Evaluation.MIN_SCORE:
                 self.best_pscore_dict[iterations] = (best_eval, timestamp)
 
         else:
@@ -160,7 +258,7 @@ class SimulatedAnnealing:
                     if self.run_optimizer:
                         self.optimizer.set_baseline_eval(best_eval)
 
-                    if best_eval != Evaluation.MIN_SCORE:
+                    if self.track_data and best_eval != Evaluation.MIN_SCORE:
                         self.best_pscore_dict[iterations] = (best_eval, timestamp)
             
             # Option 2: Assign current to best solution in previous iteration
@@ -179,7 +277,7 @@ class SimulatedAnnealing:
                 self.logger.log_program(current.to_string(), pdescr)
                 self.logger.log('Scores: ' + str(scores).strip('()'), end='\n\n')
 
-            if current_eval != Evaluation.MIN_SCORE:
+            if self.track_data and current_eval != Evaluation.MIN_SCORE:
                 self.scores_dict[iterations] = (current_eval, timestamp)
 
             iterations += 1
@@ -199,27 +297,7 @@ class SimulatedAnnealing:
 
             iterations += epochs
 
-        self.logger.log('Running Time: ' + str(round(time() - self.start, 2)) + 'seconds')
-        self.logger.log('Iterations: ' + str(iterations), end='\n\n')
-
-        # Log best program
-        pdescr = {
-                'header': 'Best Program Found By SA',
-                'psize': best.get_size(), 
-                'score': best_eval,
-                'timestamp': self.closed_list[best.to_string()][1]
-            }
-        self.logger.log_program(best.to_string(), pdescr)
-
-        # Plot data if required
-        if generate_plot:
-            self.plot(plot_filename)
-
-        # Save data
-        if save_data:
-            self.save(plot_filename)
-
-        return best, best_eval
+        return best, best_eval, iterations
 
     def save(self, plot_filename):
         plotter = Plotter()
@@ -290,17 +368,20 @@ class SimulatedAnnealing:
         ):
         epoch = 0
         mutations = 0
+        evaluated_candidates = []
         while current_t > final_t:
             best_updated = False
             header = 'Mutated Program'
             timestamp = self.get_timestamp()
 
-            # Mutate current program
-            candidate = self.program_mutator.mutate(cp.deepcopy(current), self.closed_list)
-            mutations += 1
+            # Mutate the current program into a batch of candidates and evaluate
+            # them together, then consider one candidate per epoch
+            if len(evaluated_candidates) == 0:
+                candidates = self.mutate_batch(current, self.get_batch_size(current_t, final_t))
+                evaluated_candidates = list(zip(candidates, self.evaluate_batch(candidates, eval_funct)))
 
-            # Evaluate the mutated program
-            scores, candidate_eval = eval_funct.evaluate(candidate, verbose=True)
+            candidate, (scores, candidate_eval) = evaluated_candidates.pop(0)
+            mutations += 1
 
             # Run optimizer if flag was specified
             if self.run_optimizer:
@@ -314,13 +395,16 @@ class SimulatedAnnealing:
                         self.ppool,
                         self.logger,
                         self.get_timestamp,
-                        verbose=verbose_opt
+                        verbose=verbose_opt,
+                        pool=self.pool,
+                        pool_size=self.pool_size
                     )
 
                     if is_optimized:
                         timestamp = self.get_timestamp()
-                        self.unoptimized_pscore_dict[iterations + epoch] = (unoptimized_candidate_eval, timestamp)
-                        self.optimized_pscore_dict[iterations + epoch] = (candidate_eval, timestamp)
+                        if self.track_data:
+                            self.unoptimized_pscore_dict[iterations + epoch] = (unoptimized_candidate_eval, timestamp)
+                            self.optimized_pscore_dict[iterations + epoch] = (candidate_eval, timestamp)
 
                     self.ppool = []
 
@@ -339,10 +423,11 @@ class SimulatedAnnealing:
                 if self.run_optimizer:
                     self.optimizer.set_baseline_eval(best_eval)
                 
-                self.best_pscore_dict[iterations + epoch] = (best_eval, timestamp)
+                if self.track_data:
+                    self.best_pscore_dict[iterations + epoch] = (best_eval, timestamp)
 
             # If candidate program does not raise an error, store scores
-            if candidate_eval != Evaluation.MIN_SCORE:  
+            if self.track_data and candidate_eval != Evaluation.MIN_SCORE:
                 self.scores_dict[iterations + epoch] = (candidate_eval, timestamp)
 
             self.closed_list[candidate.to_string()] = (candidate_eval, timestamp)
@@ -365,7 +450,7 @@ class SimulatedAnnealing:
             if j_diff > 0 or self.is_accept(j_diff, current_t):
                 current, current_eval = candidate, candidate_eval
             
-            current_t = self.reduce_temp(current_t, epoch)
+            current_t = self.reduce_temp(current_t)
             epoch += 1
 
         return best, best_eval, epoch+1
\ No newline at end of file
@@ -27,10 +27,10 @@ def dump(config_name, data_filename):
 
 
 def init_var_child_types(grammar):
-        VarArray.valid_children_types = [set(grammar['arrays'])]
-        VarFromArray.valid_children_types = [set(grammar['arrays']), set(grammar['array_indexes'])]
-        VarScalar.valid_children_types = [set(grammar['scalars'])]
-        Constant.valid_children_types = [set(grammar['constants'])]
+        VarArray.valid_children_types = (tuple(grammar['arrays']),)
+        VarFromArray.valid_children_types = (tuple(grammar['arrays']), tuple(grammar['array_indexes']))
+        VarScalar.valid_children_types = (tuple(grammar['scalars']),)
+        Constant.valid_children_types = (tuple(grammar['constants']),)
 
 
 def start_sa(
@@ -47,7 +47,8 @@ def start_sa(
         plot_filename, 
         ibr, 
         total_games, 
-        multi_runs
+        multi_runs,
+        batch_size=1
     ):
 
     if ibr:
@@ -103,7 +104,7 @@ def start_sa(
     else:
         optimizer = None
 
-    sa = SimulatedAnnealing(time_limit, logger, optimizer, program_mutator)
+    sa = SimulatedAnnealing(time_limit, logger, optimizer, program_mutator, batch_size=batch_size)
     
     if multi_runs[0]:
         plotter = Plotter()
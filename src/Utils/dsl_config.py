@@ -70,9 +70,10 @@ class DslConfig:
                 children_types_list.remove('None')
                 children_types_list.append(None)
             
-            node_valid_children.append(set(children_types_list))
+            # Duplicates are dropped, and the tuple can be passed to random.choice as is
+            node_valid_children.append(tuple(dict.fromkeys(children_types_list)))
 
-        return node_valid_children.copy()
+        return tuple(node_valid_children)
 
     def init_valid_children_types(self, game):
         with open(self.config_filepath) as config_f:
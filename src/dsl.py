@@ -10,6 +10,7 @@ in the PyGame-Learning-Environment.
 
 """
 from random import choice
+from math import isfinite
 from pygame.constants import K_w, K_s, K_a, K_d
 import numpy as np
 
@@ -22,22 +23,23 @@ class Node:
 
     valid_children_types = 'empty'
 
+    # Names of the env entries read by the nodes, shared by all instances
+    statename = 'state'
+    actionname = 'actions'
+    loopname = 'loop'
+
     def __init__(self):
         self.size = 1
         self.current_child_num = 0
         self.max_number_children = 0
-        self.children = []
-
-        self.statename = 'state'
-        self.actionname = 'actions'
-        self.loopname = 'loop'
+        self.children = ()
 
     def add_child(self, child):
-        if type(self).__name__ == Constant.className():
-            assert type(child).__name__ != Constant.className()
+        if __debug__ and isinstance(self, Constant):
+            assert not isinstance(child, Constant)
 
         assert len(self.children) < self.max_number_children, f'{len(self.children)} not less than {self.max_number_children}, {type(self).__name__}'
-        self.children.append(child)
+        self.children += (child,)
         self.current_child_num += 1
         
         if isinstance(child, Node):
@@ -46,8 +48,8 @@ class Node:
             self.size += 1
 
     def replace_child(self, child, i):
-        if type(self).__name__ == Constant.className():
-            assert type(child).__name__ != Constant.className()
+        if __debug__ and isinstance(self, Constant):
+            assert not isinstance(child, Constant)
         
         if isinstance(self.children[i], Node):
             self.size -= self.children[i].get_size()
@@ -59,17 +61,12 @@ class Node:
         elif child is not None:
             self.size += 1
 
-        self.children[i] = child
+        self.children = self.children[:i] + (child,) + self.children[i+1:]
 
     def check_correct_size(self):
-        size_zero_nodes = set([
-                            Strategy.className(),
-                            Constant.className(),
-                            VarScalar.className(),
-                            VarFromArray.className()
-        ])
-        
-        if type(self).__name__ in size_zero_nodes:
+        size_zero_nodes = (Strategy, Constant, VarScalar, VarFromArray)
+
+        if isinstance(self, size_zero_nodes):
             size = 0
         else:
             size = 1
@@ -95,8 +92,68 @@ class Node:
     def interpret(self):
         raise Exception("Unimplemented method: interpret")
 
+    def compile(self):
+        """
+        Traverses the AST once and returns a function of env that computes
+        the same result as interpret, without re-dispatching through the
+        nodes at every call.
+        """
+        raise Exception("Unimplemented method: compile")
+
+    def to_py_source(self, namespace, indent=0):
+        """
+        Returns the Python source of the AST. Statements are lowered
+        to indented lines and expressions to a single Python expression.
+        Values that have no literal form are bound in namespace.
+        """
+        raise Exception("Unimplemented method: to_py_source")
+
+    def compile_bytecode(self):
+        """
+        Lowers the statement AST to the source of a function run(env),
+        compiles it to CPython bytecode and returns run. As with interpret,
+        run returns 'False' if no statement returned an action. The game
+        state is looked up once per call and read by the DSFs as state.
+        """
+        namespace = {}
+        source = f"def run(env):\n\tstate = env.get({self.statename!r})\n"
+        source += f"{self.to_py_source(namespace, 1)}\n\treturn 'False'\n"
+        exec(compile(source, '<dsl>', 'exec'), namespace)
+
+        return namespace['run']
+
+    @staticmethod
+    def bind(namespace, value):
+        name = f'_v{len(namespace)}'
+        namespace[name] = value
+
+        return name
+
+    def clone(self):
+        """
+        Returns a copy of the AST. Nodes are copied recursively, while
+        the values held by the leaves, such as constants and names, are
+        shared since they are never modified in place.
+        """
+        node = object.__new__(type(self))
+        node.__dict__.update(self.__dict__)
+        node.children = tuple(child.clone() if isinstance(child, Node) else child for child in self.children)
+
+        return node
+
+    def copy(self):
+        """
+        Returns a copy of this node alone, which shares its children
+        with the original node.
+        """
+        node = object.__new__(type(self))
+        node.__dict__.update(self.__dict__)
+
+        return node
+
     def get_children(self):
-        return self.children.copy()
+        # The children are held in a tuple, which callers cannot modify
+        return self.children
 
     def get_current_child_num(self):
         return self.current_child_num
@@ -106,20 +163,22 @@ class Node:
 
     @staticmethod
     def instance(classname):
-        if classname in globals():
-            return globals()[classname]()
+        cls = Node.classes.get(classname)
+        if cls is not None:
+            return cls()
         return classname
 
     @staticmethod
     def get_class(classname):
-        if classname in globals():
-            return globals()[classname]
+        if classname in Node.classes:
+            return Node.classes[classname]
         else:
             raise Exception(f'Invalid classname: {classname}')
 
     @classmethod
     def get_valid_children_types(cls):
-        return cls.valid_children_types.copy()
+        # Set once from the grammar before the search and only read afterwards
+        return cls.valid_children_types
 
     @classmethod
     def className(cls):
@@ -142,7 +201,6 @@ class Constant(Node):
 
     @classmethod
     def new(cls, value):
-        assert value <= 100 or value >= 0
         inst = cls()
         inst.add_child(value)
         
@@ -152,7 +210,19 @@ class Constant(Node):
         return f"{self.get_children()[0]}"
 
     def interpret(self, env):
-        return self.get_children()[0]
+        return self.children[0]
+
+    def to_py_source(self, namespace, indent=0):
+        value = self.get_children()[0]
+        if value is None or type(value) in (int, str, bool):
+            return repr(value)
+        if type(value) is float and isfinite(value):
+            return repr(value)
+        return Node.bind(namespace, value)
+
+    def compile(self):
+        value = self.get_children()[0]
+        return lambda env: value
 
 
 """
@@ -173,17 +243,23 @@ class ReturnAction(Node):
         return inst
 
     def to_string(self, indent=0):
-        tab = ''
-        for _ in range(indent):
-            tab += '\t'
+        tab = '\t' * indent
         
         action = self.get_children()[0]
         return f"{tab}return {action.to_string()}"
 
     def interpret(self, env):
-        action = self.get_children()[0]
+        action = self.children[0]
         return action.interpret(env)
 
+    def to_py_source(self, namespace, indent=0):
+        tab = '\t' * indent
+        action = self.get_children()[0]
+        return f"{tab}return {action.to_py_source(namespace)}"
+
+    def compile(self):
+        return self.get_children()[0].compile()
+
 """
 This class represents a for loop in the DSL. It is interpreted as
 a for-each loop where the program iterates over each element of the
@@ -209,9 +285,7 @@ class ForEach(Node):
         return inst
 
     def to_string(self, indent=0):
-        tabs = ''
-        for _ in range(indent):
-            tabs += '\t'
+        tabs = '\t' * indent
 
         iterable = self.get_children()[0]
         loop_body = self.get_children()[1]
@@ -221,8 +295,8 @@ class ForEach(Node):
         return for_str
 
     def interpret(self, env):
-        iterable = self.get_children()[0]
-        loop_body = self.get_children()[1]
+        iterable = self.children[0]
+        loop_body = self.children[1]
 
         for element in iterable.interpret(env):
             env[self.loopname] = element
@@ -234,6 +308,29 @@ class ForEach(Node):
 
         env[self.loopname] = None
 
+    def to_py_source(self, namespace, indent=0):
+        # The loop variable lives in env, so the loop is kept as a closure
+        tab = '\t' * indent
+        return f"{tab}return {Node.bind(namespace, self.compile())}(env)"
+
+    def compile(self):
+        iterable = self.get_children()[0].compile()
+        loop_body = self.get_children()[1].compile()
+        loopname = self.loopname
+
+        def for_each(env):
+            for element in iterable(env):
+                env[loopname] = element
+                loop_res = loop_body(env)
+
+                if loop_res != 'False':
+                    env[loopname] = None
+                    return loop_res
+
+            env[loopname] = None
+
+        return for_each
+
 """
 This class represents an nested if-then-else conditional statement with depth 1 in
 the DSL. In other words, the if-else bodies can have multiple NON-NESTED if-then statements.
@@ -246,8 +343,8 @@ class NestedITEDepth1(Node):
 
     @classmethod
     def new(cls, condition, if_body, else_body):
-        assert type(if_body).__name__ in [Strategy.className(), ReturnAction.className()]
-        assert type(else_body).__name__ in [Strategy.className(), ReturnAction.className()]
+        assert isinstance(if_body, (Strategy, ReturnAction))
+        assert isinstance(else_body, (Strategy, ReturnAction))
         inst = cls()
         inst.add_child(condition)
         inst.add_child(if_body)
@@ -256,9 +353,7 @@ class NestedITEDepth1(Node):
         return inst
 
     def to_string(self, indent=0):
-        tab = ""
-        for _ in range(indent):
-            tab += "\t"
+        tab = '\t' * indent
 
         condition = self.get_children()[0]
         if_body = self.get_children()[1]
@@ -272,15 +367,34 @@ class NestedITEDepth1(Node):
         return ite_string
 
     def interpret(self, env):
-        condition = self.get_children()[0]
-        if_body = self.get_children()[1]
-        else_body = self.get_children()[2]
+        condition = self.children[0]
+        if_body = self.children[1]
+        else_body = self.children[2]
 
         if condition.interpret(env):
             return if_body.interpret(env)
         else:
             return else_body.interpret(env)
 
+    def to_py_source(self, namespace, indent=0):
+        tab = '\t' * indent
+        condition = self.get_children()[0]
+        if_body = self.get_children()[1]
+        else_body = self.get_children()[2]
+
+        ite_source = f"{tab}if {condition.to_py_source(namespace)}:\n"
+        ite_source += f"{if_body.to_py_source(namespace, indent+1)}\n"
+        ite_source += f"{tab}else:\n"
+        ite_source += f"{else_body.to_py_source(namespace, indent+1)}"
+        return ite_source
+
+    def compile(self):
+        condition = self.get_children()[0].compile()
+        if_body = self.get_children()[1].compile()
+        else_body = self.get_children()[2].compile()
+
+        return lambda env: if_body(env) if condition(env) else else_body(env)
+
 
 """
 This class represents an if-then conditional statement in the DSL. It is
@@ -295,7 +409,7 @@ class IT(Node):
 
     @classmethod
     def new(cls, condition, if_body):
-        assert type(if_body).__name__ in [ReturnAction.className(), IT.className()]
+        assert isinstance(if_body, (ReturnAction, IT))
         inst = cls()
         inst.add_child(condition)
         inst.add_child(if_body)
@@ -303,9 +417,7 @@ class IT(Node):
         return inst
 
     def to_string(self, indent=0):
-        tab = ""
-        for _ in range(indent):
-            tab += "\t"
+        tab = '\t' * indent
 
         condition = self.get_children()[0]
         if_body = self.get_children()[1]
@@ -315,13 +427,28 @@ class IT(Node):
         return it_string
 
     def interpret(self, env):
-        condition = self.get_children()[0]
-        if_body = self.get_children()[1]
+        condition = self.children[0]
+        if_body = self.children[1]
 
         if condition.interpret(env):
             return if_body.interpret(env)
 
         return 'False'
+
+    def to_py_source(self, namespace, indent=0):
+        tab = '\t' * indent
+        condition = self.get_children()[0]
+        if_body = self.get_children()[1]
+
+        it_source = f"{tab}if {condition.to_py_source(namespace)}:\n"
+        it_source += f"{if_body.to_py_source(namespace, indent+1)}"
+        return it_source
+
+    def compile(self):
+        condition = self.get_children()[0].compile()
+        if_body = self.get_children()[1].compile()
+
+        return lambda env: if_body(env) if condition(env) else 'False'
     
 
 """
@@ -337,8 +464,8 @@ class ITE(Node):
 
     @classmethod
     def new(cls, condition, if_body, else_body):
-        assert type(if_body).__name__ == ReturnAction.className()
-        assert type(else_body).__name__ == ReturnAction.className()
+        assert isinstance(if_body, ReturnAction)
+        assert isinstance(else_body, ReturnAction)
         inst = cls()
         inst.add_child(condition)
         inst.add_child(if_body)
@@ -347,9 +474,7 @@ class ITE(Node):
         return inst
 
     def to_string(self, indent=0):
-        tab = ""
-        for _ in range(indent):
-            tab += "\t"
+        tab = '\t' * indent
         
         condition = self.get_children()[0]
         if_body = self.get_children()[1]
@@ -362,15 +487,34 @@ class ITE(Node):
         return ite_string
 
     def interpret(self, env):
-        condition = self.get_children()[0]
-        if_body = self.get_children()[1]
-        else_body = self.get_children()[2]
+        condition = self.children[0]
+        if_body = self.children[1]
+        else_body = self.children[2]
 
         if condition.interpret(env):
             return if_body.interpret(env)
         else:
             return else_body.interpret(env)
 
+    def to_py_source(self, namespace, indent=0):
+        tab = '\t' * indent
+        condition = self.get_children()[0]
+        if_body = self.get_children()[1]
+        else_body = self.get_children()[2]
+
+        ite_source = f"{tab}if {condition.to_py_source(namespace)}:\n"
+        ite_source += f"{if_body.to_py_source(namespace, indent+1)}\n"
+        ite_source += f"{tab}else:\n"
+        ite_source += f"{else_body.to_py_source(namespace, indent+1)}"
+        return ite_source
+
+    def compile(self):
+        condition = self.get_children()[0].compile()
+        if_body = self.get_children()[1].compile()
+        else_body = self.get_children()[2].compile()
+
+        return lambda env: if_body(env) if condition(env) else else_body(env)
+
 
 """
 This class implements a domain-specific function that returns
@@ -404,12 +548,29 @@ class PlayerDirection(Node):
 
     def interpret(self, env):
         if self.valid_children_types != 'empty':
-            pos_index = self.get_children()[0]
-            direction = self.get_children()[1]
+            pos_index = self.children[0]
+            direction = self.children[1]
             return env[self.statename]['player_direction'][pos_index] == direction
 
         return env[self.statename]['player_direction']
 
+    def to_py_source(self, namespace, indent=0):
+        if self.valid_children_types != 'empty':
+            pos_index = self.get_children()[0]
+            direction = self.get_children()[1]
+            return f"(state['player_direction'][{pos_index!r}] == {direction!r})"
+
+        return "state['player_direction']"
+
+    def compile(self):
+        statename = self.statename
+        if self.valid_children_types != 'empty':
+            pos_index = self.get_children()[0]
+            direction = self.get_children()[1]
+            return lambda env: env[statename]['player_direction'][pos_index] == direction
+
+        return lambda env: env[statename]['player_direction']
+
 
 """
 This class implements a domain-specific function that returns
@@ -442,11 +603,26 @@ class PlayerPosition(Node):
 
     def interpret(self, env):
         if self.valid_children_types != 'empty':
-            pos_index = self.get_children()[0]
+            pos_index = self.children[0]
             return env[self.statename]['player_position'][pos_index]
 
         return env[self.statename]['player_position']
 
+    def to_py_source(self, namespace, indent=0):
+        if self.valid_children_types != 'empty':
+            pos_index = self.get_children()[0]
+            return f"state['player_position'][{pos_index!r}]"
+
+        return "state['player_position']"
+
+    def compile(self):
+        statename = self.statename
+        if self.valid_children_types != 'empty':
+            pos_index = self.get_children()[0]
+            return lambda env: env[statename]['player_position'][pos_index]
+
+        return lambda env: env[statename]['player_position']
+
 
 """
 This class implements a domain-specific function that returns the
@@ -464,6 +640,13 @@ class PlayerVelocity(Node):
     def interpret(self, env):
         return env[self.statename]['player_velocity']
 
+    def to_py_source(self, namespace, indent=0):
+        return "state['player_velocity']"
+
+    def compile(self):
+        statename = self.statename
+        return lambda env: env[statename]['player_velocity']
+
 
 """
 This class implements a domain-specific function that returns
@@ -481,6 +664,13 @@ class NonPlayerDistToPlayer(Node):
     def interpret(self, env):
         return env[self.statename]['non_player_dist_to_player']
 
+    def to_py_source(self, namespace, indent=0):
+        return "state['non_player_dist_to_player']"
+
+    def compile(self):
+        statename = self.statename
+        return lambda env: env[statename]['non_player_dist_to_player']
+
 
 """
 This class implements a domain-specific function that returns
@@ -515,11 +705,26 @@ class NonPlayerObjectPosition(Node):
 
     def interpret(self, env):
         if self.valid_children_types != 'empty':
-            pos_index = self.get_children()[0]
+            pos_index = self.children[0]
             return env[self.statename]['non_player_position'][pos_index]
 
         return env[self.statename]['non_player_position']
 
+    def to_py_source(self, namespace, indent=0):
+        if self.valid_children_types != 'empty':
+            pos_index = self.get_children()[0]
+            return f"state['non_player_position'][{pos_index!r}]"
+
+        return "state['non_player_position']"
+
+    def compile(self):
+        statename = self.statename
+        if self.valid_children_types != 'empty':
+            pos_index = self.get_children()[0]
+            return lambda env: env[statename]['non_player_position'][pos_index]
+
+        return lambda env: env[statename]['non_player_position']
+
 
 """
 This class implements a DSF that returns True if the non-player
@@ -537,6 +742,13 @@ class NonPlayerObjectApproaching(Node):
     def interpret(self, env):
         return env[self.statename]['non_player_approaching']
 
+    def to_py_source(self, namespace, indent=0):
+        return "state['non_player_approaching']"
+
+    def compile(self):
+        statename = self.statename
+        return lambda env: env[statename]['non_player_approaching']
+
 
 """
 This class implements an AST node representing a domain-specific scalar variable.
@@ -560,7 +772,14 @@ class VarScalar(Node):
         return f"{self.get_children()[0]}"
 
     def interpret(self, env):
-        return env[self.get_children()[0]]
+        return env[self.children[0]]
+
+    def to_py_source(self, namespace, indent=0):
+        return f"env[{self.get_children()[0]!r}]"
+
+    def compile(self):
+        name = self.get_children()[0]
+        return lambda env: env[name]
 
 
 """
@@ -587,9 +806,16 @@ class VarArray(Node):
         return array_name
 
     def interpret(self, env):
-        array_name = self.get_children()[0]
+        array_name = self.children[0]
         return env[array_name]
 
+    def to_py_source(self, namespace, indent=0):
+        return f"env[{self.get_children()[0]!r}]"
+
+    def compile(self):
+        array_name = self.get_children()[0]
+        return lambda env: env[array_name]
+
 
 """
 This class implements an AST node representing a domain-specific variable from
@@ -613,29 +839,51 @@ class VarFromArray(Node):
     def to_string(self, indent=0):
         name = self.get_children()[0]
         index = self.get_children()[1]
-        if isinstance(index, Node) or type(index).__name__ == Constant.className():
+        if isinstance(index, Node):
             index = index.to_string()
         
         return f"{name}[{index}]"
 
     def interpret(self, env):
-        name = self.get_children()[0]
-        index = self.get_children()[1]
-        if isinstance(index, Node) or type(index).__name__ == Constant.className():
+        name = self.children[0]
+        index = self.children[1]
+        if isinstance(index, Node):
             index = index.interpret(env)
 
         return env[name][index]
 
+    def to_py_source(self, namespace, indent=0):
+        name = self.get_children()[0]
+        index = self.get_children()[1]
+        if isinstance(index, Node):
+            index = index.to_py_source(namespace)
+        else:
+            index = repr(index)
+
+        return f"env[{name!r}][{index}]"
+
+    def compile(self):
+        name = self.get_children()[0]
+        index = self.get_children()[1]
+        if isinstance(index, Node):
+            index = index.compile()
+            return lambda env: env[name][index(env)]
+
+        return lambda env: env[name][index]
+
 
 """
-This class implements an AST node representing the '<' comparison
-operator. It returns either True or False on calling its interpret
-method.
+This is a base class for the nodes of the DSL's binary operators. It
+builds and prints the node from its two operands, while each subclass
+declares its symbol and implements interpret and compile.
 """
-class LessThan(Node):
+class BinaryOperator(Node):
+
+    symbol = None
+    parenthesize = True
 
     def __init__(self):
-        super(LessThan, self).__init__()
+        super(BinaryOperator, self).__init__()
         self.max_number_children = 2
 
     @classmethod
@@ -647,158 +895,143 @@ class LessThan(Node):
         return inst
 
     def to_string(self, indent=0):
-        return f"{self.get_children()[0].to_string()} < {self.get_children()[1].to_string()}"
+        left, right = self.children
+        op_string = f"{left.to_string()} {self.symbol} {right.to_string()}"
+        if self.parenthesize:
+            return f"({op_string})"
 
-    def interpret(self, env):
-        return self.get_children()[0].interpret(env) < self.get_children()[1].interpret(env)
+        return op_string
+
+    def to_py_source(self, namespace, indent=0):
+        left, right = self.children
+        return f"({left.to_py_source(namespace)} {self.symbol} {right.to_py_source(namespace)})"
 
 
 """
-This class implements an AST node representing the '>' comparison
+This class implements an AST node representing the '<' comparison
 operator. It returns either True or False on calling its interpret
 method.
 """
-class GreaterThan(Node):
+class LessThan(BinaryOperator):
 
-    def __init__(self):
-        super(GreaterThan, self).__init__()
-        self.max_number_children = 2
+    symbol = '<'
+    parenthesize = False
 
-    @classmethod
-    def new(cls, left, right):
-        inst = cls()
-        inst.add_child(left)
-        inst.add_child(right)
+    def interpret(self, env):
+        left, right = self.children
+        return left.interpret(env) < right.interpret(env)
 
-        return inst
+    def compile(self):
+        left = self.children[0].compile()
+        right = self.children[1].compile()
+        return lambda env: left(env) < right(env)
 
-    def to_string(self, indent=0):
-        return f"{self.get_children()[0].to_string()} > {self.get_children()[1].to_string()}"
+
+"""
+This class implements an AST node representing the '>' comparison
+operator. It returns either True or False on calling its interpret
+method.
+"""
+class GreaterThan(BinaryOperator):
+
+    symbol = '>'
+    parenthesize = False
 
     def interpret(self, env):
-        return self.get_children()[0].interpret(env) > self.get_children()[1].interpret(env)
+        left, right = self.children
+        return left.interpret(env) > right.interpret(env)
+
+    def compile(self):
+        left = self.children[0].compile()
+        right = self.children[1].compile()
+        return lambda env: left(env) > right(env)
 
 
 """
 This class implements an AST node representing the '==' comparison
 operator
 """
-class EqualTo(Node):
+class EqualTo(BinaryOperator):
 
-    def __init__(self):
-        super(EqualTo, self).__init__()
-        self.max_number_children = 2
-
-    @classmethod
-    def new(cls, left, right):
-        inst = cls()
-        inst.add_child(left)
-        inst.add_child(right)
-
-        return inst
-
-    def to_string(self, indent=0):
-        return f"{self.get_children()[0].to_string()} == {self.get_children()[1].to_string()}"
+    symbol = '=='
+    parenthesize = False
 
     def interpret(self, env):
-        return self.get_children()[0].interpret(env) == self.get_children()[1].interpret(env)
+        left, right = self.children
+        return left.interpret(env) == right.interpret(env)
+
+    def compile(self):
+        left = self.children[0].compile()
+        right = self.children[1].compile()
+        return lambda env: left(env) == right(env)
 
 
 """
 This class implements an AST node representing the addition operator.
 """
-class Plus(Node):
-
-    def __init__(self):
-        super(Plus, self).__init__()
-        self.max_number_children = 2
+class Plus(BinaryOperator):
 
-    @classmethod
-    def new(cls, left, right):
-        inst = cls()
-        inst.add_child(left)
-        inst.add_child(right)
-
-        return inst
-
-    def to_string(self, indent=0):
-        return f"({self.get_children()[0].to_string()} + {self.get_children()[1].to_string()})"
+    symbol = '+'
 
     def interpret(self, env):
-        return self.get_children()[0].interpret(env) + self.get_children()[1].interpret(env)
+        left, right = self.children
+        return left.interpret(env) + right.interpret(env)
+
+    def compile(self):
+        left = self.children[0].compile()
+        right = self.children[1].compile()
+        return lambda env: left(env) + right(env)
 
 
 """
 This class implements an AST node representing the multiplication operator
 """
-class Times(Node):
+class Times(BinaryOperator):
 
-    def __init__(self):
-        super(Times, self).__init__()
-        self.max_number_children = 2
-
-    @classmethod
-    def new(cls, left, right):
-        inst = cls()
-        inst.add_child(left)
-        inst.add_child(right)
-
-        return inst
-
-    def to_string(self, indent=0):
-        return f"({self.get_children()[0].to_string()} * {self.get_children()[1].to_string()})"
+    symbol = '*'
 
     def interpret(self, env):
-        return self.get_children()[0].interpret(env) * self.get_children()[1].interpret(env)
+        left, right = self.children
+        return left.interpret(env) * right.interpret(env)
+
+    def compile(self):
+        left = self.children[0].compile()
+        right = self.children[1].compile()
+        return lambda env: left(env) * right(env)
 
 
 """
 This class implements an AST node representing the minus operator
 """
-class Minus(Node):
-
-    def __init__(self):
-        super(Minus, self).__init__()
-        self.max_number_children = 2
+class Minus(BinaryOperator):
 
-    @classmethod
-    def new(cls, left, right):
-        inst = cls()
-        inst.add_child(left)
-        inst.add_child(right)
-
-        return inst
-
-    def to_string(self, indent=0):
-        return f"({self.get_children()[0].to_string()} - {self.get_children()[1].to_string()})"
+    symbol = '-'
 
     def interpret(self, env):
-        return self.get_children()[0].interpret(env) - self.get_children()[1].interpret(env)
+        left, right = self.children
+        return left.interpret(env) - right.interpret(env)
+
+    def compile(self):
+        left = self.children[0].compile()
+        right = self.children[1].compile()
+        return lambda env: left(env) - right(env)
 
 
 """
 This class implements an AST node representing the integer division operator
 """
-class Divide(Node):
-
-    def __init__(self):
-        super(Divide, self).__init__()
-        self.max_number_children = 2
+class Divide(BinaryOperator):
 
-    @classmethod
-    def new(cls, left, right):
-        inst = cls()
-        inst.add_child(left)
-        inst.add_child(right)
-
-        return inst
+    symbol = '//'
 
-    def to_string(self, indent=0):
-        return f"({self.get_children()[0].to_string()} // {self.get_children()[1].to_string()})"
-
-    
     def interpret(self, env):
-        return self.get_children()[0].interpret(env) // self.get_children()[1].interpret(env)
+        left, right = self.children
+        return left.interpret(env) // right.interpret(env)
+
+    def compile(self):
+        left = self.children[0].compile()
+        right = self.children[1].compile()
+        return lambda env: left(env) // right(env)
 
 
 """
@@ -813,10 +1046,10 @@ class Strategy(Node):
 
     @classmethod
     def new(cls, statement, next_statements):
-        assert type(statement).__name__ in [IT.className()]
-        assert type(next_statements).__name__ in [Strategy.className(), ReturnAction.className(), type(None).__name__]
+        assert isinstance(statement, IT)
+        assert next_statements is None or isinstance(next_statements, (Strategy, ReturnAction))
 
-        if type(statement).__name__ == ITE.className():
+        if isinstance(statement, ITE):
             next_statements = None
         
         inst = cls()
@@ -836,8 +1069,8 @@ class Strategy(Node):
         return strategy_string
 
     def interpret(self, env):
-        statement = self.get_children()[0]
-        next_statements = self.get_children()[1]
+        statement = self.children[0]
+        next_statements = self.children[1]
 
         res = statement.interpret(env)
         if res == 'False' and next_statements is not None:
@@ -845,6 +1078,37 @@ class Strategy(Node):
 
         return res
 
+    def to_py_source(self, namespace, indent=0):
+        statement = self.get_children()[0]
+        next_statements = self.get_children()[1]
+
+        strategy_source = statement.to_py_source(namespace, indent)
+        if next_statements is not None:
+            strategy_source += f"\n{next_statements.to_py_source(namespace, indent)}"
+
+        return strategy_source
+
+    def compile(self):
+        statement = self.get_children()[0].compile()
+        next_statements = self.get_children()[1]
+        if next_statements is None:
+            return statement
+
+        next_statements = next_statements.compile()
+
+        def strategy(env):
+            res = statement(env)
+            if res == 'False':
+                return next_statements(env)
+
+            return res
+
+        return strategy
+
+
+# Classes of the DSL by name, so that child types of the grammar can be
+# instantiated without searching the module namespace
+Node.classes = {cls.className(): cls for cls in list(globals().values()) if isinstance(cls, type) and issubclass(cls, Node)}
 
 # Node.valid_children_types = [set([Strategy.className(), ITE.className()])]
 
@@ -15,7 +15,6 @@ from src.BUS.start_search import start_bus
 from src.SA.start_search import start_sa
 from src.PROBE.start_search import start_probe
 from src.Evaluation.evaluation import *
-import numpy as np
 import os
 
 os.environ['SDL_VIDEODRIVER'] = 'dummy'
@@ -23,10 +22,10 @@ os.environ['SDL_VIDEODRIVER'] = 'dummy'
 def kappa_float(string):
     try:
         value = float(string)
-        assert value in np.arange(0, 10, 0.001).tolist()
+        assert 0 <= value < 10 and round(value, 3) == value
         return value
     except:
-        raise argparse.ArgumentTypeError('Kappa value has to be between 1 and 10 with 3 decimal places only')
+        raise argparse.ArgumentTypeError('Kappa value has to be between 0 (inclusive) and 10 (exclusive) with 3 decimal places only')
 
 def total_games_int(string):
     try:
@@ -36,6 +35,14 @@ def total_games_int(string):
     except:
         raise argparse.ArgumentTypeError('Total games value has to be between 2 and 1000')
 
+def batch_size_int(string):
+    try:
+        value = int(string)
+        assert value >= 1
+        return value
+    except:
+        raise argparse.ArgumentTypeError('Batch size value has to be a positive integer')
+
 
 def main():
 
@@ -91,6 +98,9 @@ def main():
     parser.add_argument('--sa-option', type=int, choices=[1, 2], dest='sa_option', default=1,
                         help='Option 1 makes it less likely for SA to be stuck in a local max')
 
+    parser.add_argument('--sa-batch', type=batch_size_int, dest='sa_batch_size', default=1, metavar='BATCH_SIZE',
+                        help='Number of mutated programs that SA evaluates in parallel at each step')
+
     parser.add_argument('--save', action='store_true', dest='save_data',
                         help='Save result of search')
 
@@ -130,6 +140,7 @@ def main():
     ibr = parameters.ibr
     kappa = parameters.kappa
     sa_option = parameters.sa_option
+    sa_batch_size = parameters.sa_batch_size
     verbose = parameters.verbose
     generate_plot = parameters.generate_plot
     save_data = parameters.save_data
@@ -196,7 +207,8 @@ def main():
             plot_filename,
             ibr,
             total_games,
-            multi_runs.copy()
+            multi_runs.copy(),
+            batch_size=sa_batch_size
         )
 
     if algorithm == 'BUS':
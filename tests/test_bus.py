@@ -0,0 +1,32 @@
+import unittest
+import src.BUS.bus_dsl as busDSL
+
+try:
+    from src.BUS.bus import Plist
+except ImportError:
+    # The BUS module imports the evaluation, which needs pygame_games
+    Plist = None
+
+
+@unittest.skipIf(Plist is None, 'src.BUS.bus cannot be imported without pygame_games')
+class TestPlist(unittest.TestCase):
+
+    def setUp(self):
+        self.plist = Plist([5.0, 5.0], [busDSL.VarScalar.new('paddle_width')], [busDSL.PlayerPosition])
+
+    def test_constants_are_bus_leaves(self):
+        constants = self.plist.get(1, busDSL.Constant.className())
+        self.assertEqual(len(constants), 2)
+        for const in constants:
+            self.assertIs(type(const), busDSL.Constant, 'Plist constants should be nodes of the BUS DSL')
+            self.assertIs(const, busDSL.Constant.new(5.0), 'Equal Plist constants should be the same node')
+
+    def test_grow_skips_equal_operands(self):
+        for op in [busDSL.LessThan, busDSL.GreaterThan, busDSL.EqualTo, busDSL.Minus, busDSL.Divide]:
+            programs = [p.to_string() for p in op.grow(self.plist, 3)]
+            self.assertNotIn(f'5.0 {op.symbol} 5.0', programs, f'{op.className()}.grow should not compare a constant with itself')
+            self.assertNotIn(f'(5.0 {op.symbol} 5.0)', programs, f'{op.className()}.grow should not combine a constant with itself')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+import src.dsl as baseDSL
+import src.BUS.bus_dsl as busDSL
+from src.BUS.bus_dsl import *
+from unittest.mock import Mock
+
+def mockPlist(programs):
+    # Mock of the BUS program list, with programs bucketed by size and type
+    buckets = {}
+    for p in programs:
+        buckets.setdefault(p.get_size(), {}).setdefault(type(p).__name__, []).append(p)
+
+    def get(size, ptype=None):
+        if ptype is None:
+            return buckets.get(size)
+        return buckets.get(size, {}).get(ptype)
+
+    def get_by_types(size, ptypes):
+        programs = []
+        for ptype, p in buckets.get(size, {}).items():
+            if ptype in ptypes:
+                programs.extend(p)
+        return programs
+
+    plist = Mock()
+    plist.get.side_effect = get
+    plist.get_by_types.side_effect = get_by_types
+    return plist
+
+
+class TestBusToString(unittest.TestCase):
+
+    def create_strategy(self, dsl):
+        """
+        Builds the following strategy with the classes of the given module:
+
+            if NonPlayerObjectPosition < (PlayerPosition + paddle_width):
+                return actions[0]
+            return actions[1]
+        """
+        return dsl.Strategy.new(
+            dsl.IT.new(
+                dsl.LessThan.new(
+                    dsl.NonPlayerObjectPosition(),
+                    dsl.Plus.new(dsl.PlayerPosition(), dsl.VarScalar.new('paddle_width'))
+                ),
+                dsl.ReturnAction.new(dsl.VarFromArray.new('actions', 0))
+            ),
+            dsl.ReturnAction.new(dsl.VarFromArray.new('actions', 1))
+        )
+
+    def test_to_string_matches_base_dsl(self):
+        program = self.create_strategy(baseDSL)
+        bus_program = self.create_strategy(busDSL)
+
+        for indent in range(3):
+            self.assertEqual(bus_program.to_string(indent), program.to_string(indent),
+                f'Cached string with indent {indent} should match the base DSL string')
+
+    def test_to_string_is_cached(self):
+        bus_program = self.create_strategy(busDSL)
+        self.assertIs(bus_program.to_string(), bus_program.to_string(), 'to_string should return the cached string')
+
+    def test_equal_strings_are_interned(self):
+        left = Plus.new(PlayerPosition(), VarScalar.new('paddle_width'))
+        right = Plus.new(PlayerPosition(), VarScalar.new('paddle_width'))
+        self.assertIs(left.to_string(), right.to_string(), 'Equal program strings should be interned')
+
+
+class TestBusLeaves(unittest.TestCase):
+
+    def test_equal_leaves_are_shared(self):
+        self.assertIs(Constant.new(5), Constant.new(5), 'Equal constants should be the same node')
+        self.assertIs(VarScalar.new('paddle_width'), VarScalar.new('paddle_width'), 'Equal scalars should be the same node')
+        self.assertIs(VarFromArray.new('actions', 0), VarFromArray.new('actions', 0), 'Equal array variables should be the same node')
+
+    def test_leaves_of_different_types_are_not_shared(self):
+        self.assertIsNot(Constant.new(1), Constant.new(1.0), 'Constants of different types should not be shared')
+        self.assertEqual(Constant.new(1.0).to_string(), '1.0')
+
+    def test_clone_can_be_modified(self):
+        program = LessThan.new(PlayerPosition(), Constant.new(5))
+        program.to_string()
+
+        # The optimizer sets the constants of the copy in place
+        clone = program.clone()
+        clone.get_children()[1].replace_child(7, 0)
+
+        self.assertEqual(clone.to_string(), 'PlayerPosition < 7', 'clone should not keep the cached string')
+        self.assertIsInstance(clone, baseDSL.LessThan)
+        self.assertNotIsInstance(clone, busDSL.LessThan, 'clone should be made of base DSL nodes')
+        self.assertEqual(program.to_string(), 'PlayerPosition < 5', 'Modifying the clone should not change the original')
+        self.assertEqual(Constant.new(5).to_string(), '5', 'Modifying the clone should not change the shared leaf')
+
+
+class TestBusGrow(unittest.TestCase):
+
+    def setUp(self):
+        self.plist = mockPlist([PlayerPosition(), VarScalar.new('paddle_width')])
+
+    def grown_strings(self, op, psize):
+        return [p.to_string() for p in op.grow(self.plist, psize)]
+
+    def test_times_skips_commutative_duplicates(self):
+        programs = self.grown_strings(Times, 3)
+        self.assertEqual(programs, ['(PlayerPosition * PlayerPosition)', '(PlayerPosition * paddle_width)',
+            '(paddle_width * paddle_width)'], 'Times.grow should not grow both (a * b) and (b * a)')
+
+    def test_times_skips_trivial_factors(self):
+        self.plist = mockPlist([PlayerPosition(), Constant.new(0), Constant.new(1.0)])
+        programs = self.grown_strings(Times, 3)
+        self.assertEqual(programs, ['(PlayerPosition * PlayerPosition)'], 'Times.grow should not multiply by 0 or 1')
+
+    def test_plus_skips_commutative_duplicates(self):
+        programs = self.grown_strings(Plus, 3)
+        self.assertEqual(programs, ['(PlayerPosition + PlayerPosition)', '(PlayerPosition + paddle_width)',
+            '(paddle_width + paddle_width)'], 'Plus.grow should not grow both (a + b) and (b + a)')
+
+    def test_skips_equal_operands_of_distinct_nodes(self):
+        self.plist = mockPlist([baseDSL.Constant.new(5.0), baseDSL.Constant.new(5.0)])
+        for op in [LessThan, GreaterThan, EqualTo, Minus, Divide]:
+            self.assertEqual(self.grown_strings(op, 3), [], f'{op.className()}.grow should not compare a program with itself')
+
+
+if __name__ == '__main__':
+    unittest.main()
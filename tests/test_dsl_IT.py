@@ -12,9 +12,7 @@ class TestIT(unittest.TestCase):
 
         # Create mock object
         self.if_cond = Mock()
-        self.if_body = Mock()
-        
-        type(self.if_body).__name__ = 'ReturnAction'
+        self.if_body = Mock(spec=ReturnAction)
 
         self.if_cond.get_size.return_value = 1
         self.if_body.get_size.return_value = 1
@@ -22,6 +20,8 @@ class TestIT(unittest.TestCase):
     def init_IT(self, cond, body):
         self.if_cond.interpret.return_value = self.env[cond]
         self.if_body.interpret.return_value = self.env[body]
+        self.if_cond.compile.return_value = lambda env: env[cond]
+        self.if_body.compile.return_value = lambda env: env[body]
         return IT.new(self.if_cond, self.if_body)      
 
     def test_size_three(self):
@@ -55,5 +55,13 @@ class TestIT(unittest.TestCase):
         it = self.init_IT('TRUE', 'BODY')
         self.assertEqual(it.interpret(self.env), 100, 'interpret method of IT should return 100')
 
+    def test_compile_false_cond(self):
+        it = self.init_IT('FALSE', 'BODY')
+        self.assertEqual(it.compile()(self.env), 'False', 'compiled IT should return \'False\'')
+
+    def test_compile_true_cond(self):
+        it = self.init_IT('TRUE', 'BODY')
+        self.assertEqual(it.compile()(self.env), 100, 'compiled IT should return 100')
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
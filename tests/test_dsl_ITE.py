@@ -12,11 +12,8 @@ class TestITE(unittest.TestCase):
         self.env['ELSE_BODY'] = 53
         
         self.if_cond = Mock()
-        self.if_body = Mock()
-        self.else_body = Mock()
-
-        type(self.if_body).__name__ = 'ReturnAction'
-        type(self.else_body).__name__ = 'ReturnAction'
+        self.if_body = Mock(spec=ReturnAction)
+        self.else_body = Mock(spec=ReturnAction)
 
         self.if_cond.get_size.return_value = 1
         self.if_body.get_size.return_value = 1
@@ -26,6 +23,9 @@ class TestITE(unittest.TestCase):
         self.if_cond.interpret.return_value = self.env[if_cond]
         self.if_body.interpret.return_value = self.env[if_body]
         self.else_body.interpret.return_value = self.env[else_body]
+        self.if_cond.compile.return_value = lambda env: env[if_cond]
+        self.if_body.compile.return_value = lambda env: env[if_body]
+        self.else_body.compile.return_value = lambda env: env[else_body]
         return ITE.new(self.if_cond, self.if_body, self.else_body)
 
     def test_size_four(self):
@@ -57,6 +57,13 @@ class TestITE(unittest.TestCase):
         ite = self.init_ITE('TRUE', 'IF_BODY', 'ELSE_BODY')
         self.assertEqual(ite.interpret(self.env), 100, 'interpret method of ITE object should return 100')
 
+    def test_compile(self):
+        ite = self.init_ITE('TRUE', 'IF_BODY', 'ELSE_BODY')
+        self.assertEqual(ite.compile()(self.env), 100, 'compiled ITE object should return 100')
+
+        ite = self.init_ITE('FALSE', 'IF_BODY', 'ELSE_BODY')
+        self.assertEqual(ite.compile()(self.env), 53, 'compiled ITE object should return 53')
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -3,10 +3,9 @@ from src.dsl import VarArray, VarScalar, VarFromArray, Constant
 from unittest.mock import Mock
 
 def Const(value):
-    const = Mock()
+    const = Mock(spec=Constant)
     const.get_size.return_value = 1
     const.interpret.return_value = value
-    type(const).__name__ = Constant.className()
     return const
 
 
@@ -0,0 +1,93 @@
+import unittest
+from src.dsl import Strategy, ForEach, NestedITEDepth1, IT, ITE, ReturnAction, LessThan, GreaterThan, EqualTo, \
+    Plus, Times, Minus, Divide, VarScalar, VarArray, VarFromArray, Constant, PlayerPosition, PlayerVelocity, \
+    NonPlayerObjectPosition, NonPlayerObjectApproaching
+
+def state(**features):
+    return {'state': dict({'player_position': 3, 'non_player_position': 5, 'player_velocity': 1.5,
+        'non_player_approaching': True}, **features), 'actions': ['left', 'stay', 'right'], 'positions': [7, 5, 3]}
+
+
+class TestCompileBytecode(unittest.TestCase):
+
+    def assertSameResult(self, p, envs):
+        run = p.compile_bytecode()
+        for env in envs:
+            self.assertEqual(run(env), p.interpret(env), f'bytecode of\n{p.to_string()}should return the result of interpret')
+
+    def test_operators_keep_their_precedence(self):
+        # (10 - (3 - 2)) and ((1 + 2) * 3) change value without the parentheses
+        left = Minus.new(Constant.new(10), Minus.new(Constant.new(3), Constant.new(2)))
+        right = Times.new(Plus.new(Constant.new(1), Constant.new(2)), Constant.new(3))
+        p = IT.new(EqualTo.new(left, right), ReturnAction.new(VarFromArray.new('actions', 0)))
+        self.assertEqual(p.compile_bytecode()(state()), 'left', 'bytecode should keep the precedence of the AST')
+
+        divide = Divide.new(Constant.new(7), Minus.new(Constant.new(4), Constant.new(2)))
+        for operator in [LessThan, GreaterThan, EqualTo]:
+            p = IT.new(operator.new(divide, PlayerPosition()), ReturnAction.new(VarFromArray.new('actions', 2)))
+            self.assertSameResult(p, [state(player_position=position) for position in [2, 3, 4]])
+
+    def test_constants(self):
+        for value in [5, -3, 0.1, -1.5, 1e-20, float('inf'), -float('inf'), True, 'stay']:
+            p = IT.new(EqualTo.new(Constant.new(value), Constant.new(value)), ReturnAction.new(Constant.new(value)))
+            self.assertEqual(p.compile_bytecode()(state()), value, f'bytecode should return the constant {value!r}')
+
+        p = IT.new(LessThan.new(PlayerVelocity(), Constant.new(float('nan'))), ReturnAction.new(VarFromArray.new('actions', 0)))
+        self.assertSameResult(p, [state()])
+
+    def test_var_from_array(self):
+        index = Minus.new(PlayerPosition(), Constant.new(2))
+        p = IT.new(
+            LessThan.new(VarFromArray.new('positions', index), NonPlayerObjectPosition()),
+            ReturnAction.new(VarFromArray.new('actions', index))
+        )
+        self.assertSameResult(p, [state(player_position=position) for position in [2, 3, 4]])
+
+    def test_nested_ite(self):
+        inner = Strategy.new(
+            IT.new(NonPlayerObjectApproaching(), ReturnAction.new(VarFromArray.new('actions', 1))),
+            ReturnAction.new(VarFromArray.new('actions', 2))
+        )
+        p = NestedITEDepth1.new(
+            LessThan.new(PlayerPosition(), NonPlayerObjectPosition()),
+            inner,
+            ReturnAction.new(VarFromArray.new('actions', 0))
+        )
+        envs = [state(player_position=position, non_player_approaching=approaching)
+            for position in [3, 7] for approaching in [True, False]]
+        self.assertSameResult(p, envs)
+
+        p = ITE.new(
+            GreaterThan.new(PlayerPosition(), NonPlayerObjectPosition()),
+            ReturnAction.new(VarFromArray.new('actions', 0)),
+            ReturnAction.new(VarFromArray.new('actions', 2))
+        )
+        self.assertSameResult(p, [state(player_position=position) for position in [3, 7]])
+
+    def test_for_each(self):
+        loop_body = Strategy.new(
+            IT.new(EqualTo.new(VarScalar.new('loop'), NonPlayerObjectPosition()), ReturnAction.new(VarScalar.new('loop'))),
+            None
+        )
+        p = ForEach.new(VarArray.new('positions'), loop_body)
+        envs = [state(non_player_position=position) for position in [5, 3, 4]]
+        self.assertSameResult(p, envs)
+        self.assertEqual(p.compile_bytecode()(state(non_player_position=3)), 3, 'bytecode should return the matching element')
+
+    def test_no_match_returns_false(self):
+        p = Strategy.new(
+            IT.new(LessThan.new(PlayerPosition(), Constant.new(0)), ReturnAction.new(VarFromArray.new('actions', 0))),
+            Strategy.new(
+                IT.new(
+                    NonPlayerObjectApproaching(),
+                    IT.new(GreaterThan.new(PlayerPosition(), Constant.new(5)), ReturnAction.new(VarFromArray.new('actions', 2)))
+                ),
+                None
+            )
+        )
+        self.assertEqual(p.compile_bytecode()(state()), 'False', 'bytecode should return \'False\' when no statement returns')
+        self.assertSameResult(p, [state(player_position=position) for position in [-1, 3, 6]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 from unittest.loader import makeSuite
+from unittest.mock import patch
 from src.dsl import NonPlayerObjectPosition, PlayerPosition
 
 class TestPlayerPosition(unittest.TestCase):
@@ -22,10 +23,10 @@ class TestPlayerPosition(unittest.TestCase):
             p_position.interpret(self.env)
 
     def test_interpret_with_index(self):
-        PlayerPosition.valid_children_types = [set([0, 1, 2])]
-        p_position = PlayerPosition.new(2)
-        self.env['state']['player_position'] = [60, 40, 100]
-        self.assertEqual(p_position.interpret(self.env), 100, 'interpret method of PlayerPosition should return 100')
+        with patch.object(PlayerPosition, 'valid_children_types', [set([0, 1, 2])]):
+            p_position = PlayerPosition.new(2)
+            self.env['state']['player_position'] = [60, 40, 100]
+            self.assertEqual(p_position.interpret(self.env), 100, 'interpret method of PlayerPosition should return 100')
 
 
 class TestNonPlayerPosition(unittest.TestCase):
@@ -48,11 +49,11 @@ class TestNonPlayerPosition(unittest.TestCase):
             p_position.interpret(self.env)
 
     def test_interpret_with_index(self):
-        NonPlayerObjectPosition.valid_children_types = [set([0, 1, 2])]
-        p_position = NonPlayerObjectPosition.new(1)
+        with patch.object(NonPlayerObjectPosition, 'valid_children_types', [set([0, 1, 2])]):
+            p_position = NonPlayerObjectPosition.new(1)
 
-        self.env['state']['non_player_position'] = [55, 45, 36]
-        self.assertEqual(p_position.interpret(self.env), 45, 'interpret method NonPlayerObjectPosition object should return 45')
+            self.env['state']['non_player_position'] = [55, 45, 36]
+            self.assertEqual(p_position.interpret(self.env), 45, 'interpret method NonPlayerObjectPosition object should return 45')
 
 
 if __name__ == '__main__':
@@ -6,6 +6,7 @@ def mockOperand(value):
         op = Mock()
         op.get_size.return_value = 1
         op.interpret.return_value = value
+        op.compile.return_value = lambda env: value
         return op
 
 
@@ -35,6 +36,10 @@ class TestMinus(unittest.TestCase):
         minus = Minus.new(mockOperand(100), mockOperand(35))
         self.assertEqual(minus.interpret({}), 65, 'interpret method of Minus object should return 65')
 
+    def test_compile(self):
+        minus = Minus.new(mockOperand(100), mockOperand(35))
+        self.assertEqual(minus.compile()({}), 65, 'compiled Minus object should return 65')
+
 
 class TestAdd(unittest.TestCase):
 
@@ -61,6 +66,10 @@ class TestAdd(unittest.TestCase):
         plus = Plus.new(mockOperand(100), mockOperand(35))
         self.assertEqual(plus.interpret({}), 135, 'interpret method of Plus object should return 135')
 
+    def test_compile(self):
+        plus = Plus.new(mockOperand(100), mockOperand(35))
+        self.assertEqual(plus.compile()({}), 135, 'compiled Plus object should return 135')
+
 
 class TestTimes(unittest.TestCase):
 
@@ -87,6 +96,10 @@ class TestTimes(unittest.TestCase):
         times = Times.new(mockOperand(100), mockOperand(35))
         self.assertEqual(times.interpret({}), 3500, 'interpret method of Times object should return 3500')
 
+    def test_compile(self):
+        times = Times.new(mockOperand(100), mockOperand(35))
+        self.assertEqual(times.compile()({}), 3500, 'compiled Times object should return 3500')
+
 
 class TestDivide(unittest.TestCase):
 
@@ -122,6 +135,10 @@ class TestDivide(unittest.TestCase):
         test_msg = 'interpret method of Divide object should raise ZeroDivisionError'
         with self.assertRaises(ZeroDivisionError, msg=test_msg) as cm:
             divide.interpret({})
+
+    def test_compile(self):
+        divide = Divide.new(mockOperand(100), mockOperand(3))
+        self.assertEqual(divide.compile()({}), 33, 'compiled Divide object should return 33')
     
 
 if __name__ == '__main__':
@@ -1,20 +1,29 @@
 import unittest
-from src.dsl import Strategy, IT
+from src.dsl import Strategy, IT, ReturnAction, LessThan, VarScalar, VarFromArray, Constant
 from unittest.mock import Mock
 
+def mockSource(value, indent):
+    # A statement returning 'False' falls through to the next statement
+    if value == 'False':
+        return '\t' * indent + 'pass'
+    return '\t' * indent + f'return {value!r}'
+
+
 def FirstStatement(value):
-    statement = Mock()
+    statement = Mock(spec=IT)
     statement.get_size.return_value = 1
     statement.interpret.return_value = value
-    type(statement).__name__ = IT.className()
+    statement.compile.return_value = lambda env: value
+    statement.to_py_source.side_effect = lambda namespace, indent=0: mockSource(value, indent)
     return statement
 
 
 def NextStatement(value):
-    statement = Mock()
+    statement = Mock(spec=Strategy)
     statement.get_size.return_value = 1
     statement.interpret.return_value = value
-    type(statement).__name__ = Strategy.className()
+    statement.compile.return_value = lambda env: value
+    statement.to_py_source.side_effect = lambda namespace, indent=0: mockSource(value, indent)
     return statement
 
 
@@ -35,12 +44,10 @@ class TestStrategy(unittest.TestCase):
 
     def test_raises_assertion_error(self):
         first_statement = FirstStatement(10)
-        first_statement.__class__.__name__ = 'FirstStatement'
         test_msg = 'Strategy constructor should raise AssertionError'
         with self.assertRaises(AssertionError, msg=test_msg) as cm:
-            Strategy.new(first_statement, None)
+            Strategy.new(NextStatement(10), None)
 
-        first_statement.__class__.__name__ = IT.className()
         with self.assertRaises(AssertionError, msg=test_msg) as cm:
             Strategy.new(first_statement, first_statement)
 
@@ -66,6 +73,51 @@ class TestStrategy(unittest.TestCase):
         s = Strategy.new(first, second)
         self.assertEqual(s.interpret({}), None, 'interpret method of Strategy object should return None')
 
+    def test_compile(self):
+        s = Strategy.new(FirstStatement('False'), NextStatement(80))
+        self.assertEqual(s.compile()({}), 80, 'compiled Strategy object should return 80')
+
+        s = Strategy.new(FirstStatement(60), NextStatement(80))
+        self.assertEqual(s.compile()({}), 60, 'compiled Strategy object should return 60')
+
+        s = Strategy.new(FirstStatement('False'), None)
+        self.assertEqual(s.compile()({}), 'False', 'compiled Strategy object should return \'False\'')
+
+    def test_compile_bytecode(self):
+        s = Strategy.new(FirstStatement('False'), NextStatement(80))
+        self.assertEqual(s.compile_bytecode()({}), 80, 'bytecode of Strategy object should return 80')
+
+        s = Strategy.new(FirstStatement(60), NextStatement(80))
+        self.assertEqual(s.compile_bytecode()({}), 60, 'bytecode of Strategy object should return 60')
+
+        s = Strategy.new(FirstStatement('False'), None)
+        self.assertEqual(s.compile_bytecode()({}), 'False', 'bytecode of Strategy object should return \'False\'')
+
+    def test_clone(self):
+        condition = LessThan.new(VarScalar.new('x'), Constant.new(5))
+        s = Strategy.new(IT.new(condition, ReturnAction.new(VarFromArray.new('actions', 0))), None)
+        clone = s.clone()
+
+        self.assertIsNot(clone, s, 'clone should return a new Strategy object')
+        self.assertIsNot(clone.get_children()[0], s.get_children()[0], 'clone should copy the children of the AST')
+        self.assertEqual(clone.to_string(), s.to_string(), 'clone should have the same string representation')
+        self.assertEqual(clone.get_size(), s.get_size(), 'clone should have the same size')
+
+        clone.get_children()[0].get_children()[0].replace_child(Constant.new(10), 1)
+        self.assertEqual(s.to_string(), 'if x < 5:\n\treturn actions[0]\n', 'Mutating the clone should not change the original')
+
+    def test_copy(self):
+        condition = LessThan.new(VarScalar.new('x'), Constant.new(5))
+        s = Strategy.new(IT.new(condition, ReturnAction.new(VarFromArray.new('actions', 0))), None)
+        copy = s.copy()
+
+        self.assertIsNot(copy, s, 'copy should return a new Strategy object')
+        self.assertIs(copy.get_children()[0], s.get_children()[0], 'copy should share the children of the node')
+
+        copy.replace_child(ReturnAction.new(VarFromArray.new('actions', 1)), 0)
+        self.assertEqual(s.to_string(), 'if x < 5:\n\treturn actions[0]\n', 'Replacing a child of the copy should not change the original')
+        self.assertEqual(copy.to_string(), 'return actions[1]\n', 'copy should hold the new child')
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
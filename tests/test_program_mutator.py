@@ -0,0 +1,85 @@
+import os
+import random
+import unittest
+from src.dsl import Node, VarArray, VarFromArray, VarScalar, Constant
+from src.SA.program_mutator import ProgramMutator
+from src.Utils.dsl_config import DslConfig
+
+def get_nodes(p):
+    # Every node of p with the children it holds, in preorder
+    nodes = []
+    stack = [p]
+    while stack:
+        node = stack.pop()
+        nodes.append((node, list(node.get_children())))
+        stack.extend(child for child in reversed(node.get_children()) if isinstance(child, Node))
+
+    return nodes
+
+
+class TestProgramMutator(unittest.TestCase):
+
+    def setUp(self):
+        # The grammar is set on the classes of the DSL, so it is restored after each test
+        self.children_types = {cls: vars(cls).get('valid_children_types') for cls in Node.classes.values()}
+
+        config = DslConfig(os.path.join(os.path.dirname(__file__), '..', 'src', 'dsl_config.json'))
+        config.init_valid_children_types('Catcher')
+        grammar = config.get_grammar('Catcher')
+        VarArray.valid_children_types = (tuple(grammar['arrays']),)
+        VarFromArray.valid_children_types = (tuple(grammar['arrays']), tuple(grammar['array_indexes']))
+        VarScalar.valid_children_types = (tuple(grammar['scalars']),)
+        Constant.valid_children_types = (tuple(grammar['constants']),)
+
+        random.seed(0)
+        self.program_mutator = ProgramMutator(0, 4, 50)
+
+    def tearDown(self):
+        for cls, children_types in self.children_types.items():
+            if children_types is None:
+                if 'valid_children_types' in vars(cls):
+                    delattr(cls, 'valid_children_types')
+            else:
+                cls.valid_children_types = children_types
+
+    def assertUnchanged(self, p, p_string, p_nodes):
+        self.assertEqual(p.to_string(), p_string, 'Mutation should not change the string of the original program')
+        nodes = get_nodes(p)
+        self.assertEqual(len(nodes), len(p_nodes), 'Mutation should not change the nodes of the original program')
+        for (node, children), (p_node, p_children) in zip(nodes, p_nodes):
+            self.assertIs(node, p_node, 'Mutation should not replace the nodes of the original program')
+            self.assertEqual(len(children), len(p_children))
+            for child, p_child in zip(children, p_children):
+                self.assertIs(child, p_child, 'Mutation should not replace the children of the original program')
+
+    def test_mutate_inner_nodes_copies_path(self):
+        for _ in range(20):
+            p = self.program_mutator.generate_random({})
+            p_string = p.to_string()
+            p_nodes = get_nodes(p)
+
+            for index in range(1, p.get_size() + 1):
+                mutated_p = self.program_mutator.mutate_inner_nodes(p, index)
+                if mutated_p is not None:
+                    self.assertIsNot(mutated_p, p, 'Mutation should return a new root')
+                self.assertUnchanged(p, p_string, p_nodes)
+
+    def test_mutate_leaves_original_unchanged(self):
+        closed_list = {}
+        p = self.program_mutator.generate_random(closed_list)
+        for _ in range(200):
+            p_string = p.to_string()
+            p_nodes = get_nodes(p)
+
+            mutated_p = self.program_mutator.mutate(p, closed_list)
+            closed_list[mutated_p.to_string()] = 1
+            self.assertUnchanged(p, p_string, p_nodes)
+
+            # Later mutations start from programs sharing subtrees with
+            # earlier ones
+            if random.random() < 0.5:
+                p = mutated_p
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from multiprocessing.dummy import Pool
+from unittest.mock import Mock
+
+try:
+    from src.SA.sim_anneal import SimulatedAnnealing
+except ImportError:
+    # The SA module imports the evaluation and the plotter, which need
+    # pygame_games and matplotlib
+    SimulatedAnnealing = None
+
+def mockProgram(name):
+    program = Mock()
+    program.to_string.return_value = name
+    return program
+
+
+@unittest.skipIf(SimulatedAnnealing is None, 'src.SA.sim_anneal cannot be imported without its dependencies')
+class TestSimulatedAnnealingBatch(unittest.TestCase):
+
+    def create_sa(self, mutations, batch_size):
+        program_mutator = Mock()
+        program_mutator.mutate.side_effect = mutations
+
+        sa = SimulatedAnnealing(0, Mock(), None, program_mutator, batch_size=batch_size)
+        sa.init_attributes(None)
+        sa.closed_list = {}
+        sa.pool = None
+        return sa
+
+    def test_rejects_empty_batches(self):
+        for batch_size in [0, -1]:
+            with self.assertRaises(AssertionError, msg=f'Batch size {batch_size} should be rejected'):
+                SimulatedAnnealing(0, Mock(), None, Mock(), batch_size=batch_size)
+
+    def test_mutate_batch_returns_distinct_candidates(self):
+        mutations = [mockProgram(name) for name in ['a', 'a', 'b', 'a', 'c']]
+        sa = self.create_sa(mutations, 3)
+
+        candidates = sa.mutate_batch(mockProgram('current'), 3)
+        self.assertEqual([c.to_string() for c in candidates], ['a', 'b', 'c'], 'Batch should only hold distinct candidates')
+
+    def test_mutate_batch_terminates_without_enough_mutations(self):
+        sa = self.create_sa(lambda current, closed_list: mockProgram('a'), 3)
+
+        candidates = sa.mutate_batch(mockProgram('current'), 3)
+        self.assertEqual([c.to_string() for c in candidates], ['a'], 'Batch should be cut short')
+        self.assertEqual(sa.program_mutator.mutate.call_count, SimulatedAnnealing.BATCH_ATTEMPTS * 3,
+            'Batch should stop mutating after BATCH_ATTEMPTS mutations per candidate')
+
+    def test_batch_size_is_limited_by_epochs_left(self):
+        sa = self.create_sa([], 4)
+
+        self.assertEqual(sa.get_batch_size(100, 1), 4, 'Batch should be full when enough epochs are left')
+        self.assertEqual(sa.get_batch_size(1.2, 1), 2, 'Batch should only hold the epochs left in the run')
+        self.assertEqual(sa.get_batch_size(1, 1), 0, 'Batch should be empty once the run is over')
+
+    def test_evaluate_batch_keeps_candidate_order(self):
+        candidates = [mockProgram(name) for name in ['a', 'b', 'c', 'd', 'e']]
+        evals = {'a': 5, 'b': 1, 'c': 4, 'd': 2, 'e': 3}
+        eval_funct = Mock()
+        eval_funct.evaluate.side_effect = lambda p, verbose: ((evals[p.to_string()],), evals[p.to_string()])
+
+        sa = self.create_sa([], 5)
+        sa.pool_size = 2
+        with Pool(sa.pool_size) as pool:
+            sa.pool = pool
+            results = sa.evaluate_batch(candidates, eval_funct)
+
+        self.assertEqual(results, [((5,), 5), ((1,), 1), ((4,), 4), ((2,), 2), ((3,), 3)],
+            'Results should be in the order of the candidates')
+        self.assertEqual(eval_funct.evaluate.call_count, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
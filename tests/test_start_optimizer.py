@@ -0,0 +1,90 @@
+from src.Optimizer.start_optimizer import start_optimizer
+from unittest.mock import Mock
+import unittest
+import os
+
+def mockProgram(name, clone=True):
+    program = Mock()
+    program.get_size.return_value = 1
+    program.to_string.return_value = name
+    if clone:
+        program.clone.return_value = mockProgram(name, clone=False)
+    return program
+
+
+class TestStartOptimizer(unittest.TestCase):
+
+    def setUp(self):
+        self.first = mockProgram('first')
+        self.second = mockProgram('second')
+        self.ppool = [(self.first, 10, (10,)), (self.second, 20, (20,))]
+
+        # The first program is improved by the optimizer, the second is not
+        results = {
+            'first': ({'Const1': 1}, 30, (30,), True),
+            'second': ({}, 20, (20,), False)
+        }
+        self.optimizer = Mock()
+        self.optimizer.optimize.side_effect = lambda ast, score, scores: (ast,) + results[ast.to_string()]
+        self.optimizer.get_avg_time.return_value = None
+        self.logger = Mock()
+
+    def test_returns_best_optimized_program(self):
+        result = start_optimizer(self.optimizer, self.ppool, self.logger, lambda: 0)
+        self.assertEqual(result, (self.first.clone(), 30, (30,), True), 'Should return the first program with its optimized score')
+
+    def test_optimizes_copies_in_process(self):
+        start_optimizer(self.optimizer, self.ppool, self.logger, lambda: 0)
+        optimized = [args[0] for args, _ in self.optimizer.optimize.call_args_list]
+        self.assertEqual(optimized, [self.first.clone(), self.second.clone()], 'Should optimize copies of the programs in-process')
+
+    def test_logs_optimized_programs(self):
+        start_optimizer(self.optimizer, self.ppool, self.logger, lambda: 0)
+        self.assertEqual(self.logger.log_program.call_count, 1, 'Should only log the optimized program')
+
+    def test_uses_given_pool(self):
+        pool = Mock()
+        pool.imap_unordered.side_effect = lambda f, args, **kwargs: [f(a) for a in reversed(args)]
+        result = start_optimizer(self.optimizer, self.ppool, self.logger, lambda: 0, pool=pool, pool_size=2)
+
+        self.assertTrue(pool.imap_unordered.called, 'Should optimize the programs with the given pool')
+        self.assertEqual(result, (self.first, 30, (30,), True), 'Should return the first program with its optimized score')
+        self.assertFalse(self.first.clone.called, 'Should not copy the programs sent to the workers')
+
+    def test_skips_pool_for_fast_optimizations(self):
+        pool = Mock()
+        self.optimizer.get_avg_time.return_value = 0.001
+        result = start_optimizer(self.optimizer, self.ppool, self.logger, lambda: 0, pool=pool, pool_size=2)
+
+        self.assertFalse(pool.imap_unordered.called, 'Should optimize the programs in-process')
+        self.assertEqual(result, (self.first.clone(), 30, (30,), True), 'Should return the first program with its optimized score')
+        self.assertTrue(self.optimizer.update_avg_time.called, 'Should update the average optimize time')
+
+    def test_uses_pool_for_slow_optimizations(self):
+        pool = Mock()
+        pool.imap_unordered.side_effect = lambda f, args, **kwargs: [f(a) for a in args]
+        self.optimizer.get_avg_time.return_value = 1.0
+        start_optimizer(self.optimizer, self.ppool, self.logger, lambda: 0, pool=pool, pool_size=2)
+
+        self.assertTrue(pool.imap_unordered.called, 'Should optimize the programs with the given pool')
+
+    def test_avg_time_ignores_programs_without_constants(self):
+        start_optimizer(self.optimizer, [(self.second, 20, (20,))], self.logger, lambda: 0)
+        self.assertFalse(self.optimizer.update_avg_time.called, 'Programs without constants should not update the average optimize time')
+
+        start_optimizer(self.optimizer, self.ppool, self.logger, lambda: 0)
+        self.assertEqual(self.optimizer.update_avg_time.call_count, 1, 'Programs with constants should update the average optimize time')
+
+    def test_sends_programs_one_by_one(self):
+        # SA fills the pool with max(5, cpu_count) programs before a parallel run
+        ppool = [(mockProgram('first'), 10, (10,)) for _ in range(max(5, os.cpu_count()))]
+        pool = Mock()
+        pool.imap_unordered.side_effect = lambda f, args, **kwargs: [f(a) for a in args]
+        start_optimizer(self.optimizer, ppool, self.logger, lambda: 0, pool=pool, pool_size=os.cpu_count())
+
+        self.assertEqual(pool.imap_unordered.call_args.kwargs['chunksize'], 1, 'Should send one program at a time to the workers')
+        self.assertEqual(self.optimizer.optimize.call_count, len(ppool), 'Should optimize every program of the pool')
+
+
+if __name__ == '__main__':
+    unittest.main()